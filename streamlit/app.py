@@ -3,7 +3,6 @@ Main Streamlit application for the Country Currency App.
 This is a modern dark-themed interface for managing country-currency mappings.
 """
 import streamlit as st
-import os
 import sys
 import time
 import logging
@@ -17,6 +16,18 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# The log format doesn't show thread or process details, so don't look them up per record
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+
+# Version footer shown below every view
+APP_FOOTER = """
+<div style="text-align: center; margin-top: 50px; color: #666;">
+Country Currency App v1.0.0 | Powered by Streamlit & Databricks
+</div>
+"""
+
 # Debug mode - set to False to disable debug messages
 DEBUG_MODE = False
 
@@ -24,23 +35,24 @@ def debug_print(*args, **kwargs):
     """Print only when in debug mode or log at debug level."""
     if DEBUG_MODE:
         print(*args, **kwargs)
-    logger.debug(" ".join(str(a) for a in args))
+    # Only build the message when a debug handler will actually see it
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(" ".join(map(str, args)))
 
 # Removed duplicate refresh_data function - using the one from utils.app_utils instead
 
-# Add the project to the Python path
-sys.path.insert(0, str(Path(__file__).parent))
+# Resolve the app directory once; Streamlit re-executes this script on every rerun
+APP_DIR = Path(__file__).resolve().parent
+CSS_PATH = APP_DIR / "ui" / "styles" / "style.css"
+
+# Add the project to the Python path (only once, so reruns don't keep growing sys.path)
+if str(APP_DIR) not in sys.path:
+    sys.path.insert(0, str(APP_DIR))
 
-# Import application modules
-from utils.databricks_client import DatabricksClient
-from operations.data_operations import DataOperations
+# Import application modules (view modules are imported in their branches below,
+# so only the page being shown pays for its imports)
 from ui.sidebar import render_sidebar
-from ui.main_view import render_main_view
-from ui.crud_views import render_crud_views
-from config.app_config import AppConfig
-from utils.status_checker import check_databricks_job_status
-from templates.html_components import app_header, footer
-from utils.app_utils import refresh_data
+from utils.utils import load_css
 
 # Set page configuration
 st.set_page_config(
@@ -50,10 +62,8 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Load custom CSS
-css_path = os.path.join(os.path.dirname(__file__), "ui", "styles", "style.css")
-with open(css_path, 'r') as f:
-    st.markdown(f'<style>{f.read()}</style>', unsafe_allow_html=True)
+# Load custom CSS (cached; only re-read when the file changes)
+load_css(str(CSS_PATH))
 
 # Initialize session state
 if "authenticated" not in st.session_state:
@@ -70,8 +80,10 @@ render_sidebar()
 
 # Render the main content based on the current view
 if st.session_state.current_view == "home":
+    from ui.main_view import render_main_view
     render_main_view()
 elif st.session_state.current_view in ["add", "edit", "delete"]:
+    from ui.crud_views import render_crud_views
     render_crud_views()
 elif st.session_state.current_view == "batch_upload":
     try:
@@ -92,11 +104,8 @@ elif st.session_state.current_view == "analytics":
 else:
     # Default to home view if the current view is invalid
     st.session_state.current_view = "home"
+    from ui.main_view import render_main_view
     render_main_view()
 
 # Display version info in footer
-st.markdown("""
-<div style="text-align: center; margin-top: 50px; color: #666;">
-Country Currency App v1.0.0 | Powered by Streamlit & Databricks
-</div>
-""", unsafe_allow_html=True)
+st.markdown(APP_FOOTER, unsafe_allow_html=True)
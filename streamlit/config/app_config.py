@@ -1,13 +1,20 @@
 """
 App configuration module for Streamlit application.
 """
+from functools import cached_property
+from urllib.parse import urlsplit
 
 class AppConfig:
     """Configuration for the Streamlit app."""
     
     def __init__(self, host: str = "", token: str = "", catalog: str = "main", schema: str = "default", 
-                table: str = "country_currency", job_id: str = None, warehouse_id: str = None):
-        """Initialize the application configuration."""
+                table: str = "country_currency", job_id: str = None, warehouse_id: str = None,
+                pool_size: int = 1):
+        """Initialize the application configuration.
+
+        pool_size is the number of SQL connections each client may hold; a session runs its
+        queries one at a time, so one is enough unless something issues them concurrently.
+        """
         self.host = host
         self.token = token
         self.catalog = catalog
@@ -15,9 +22,14 @@ class AppConfig:
         self.table = table
         self.job_id = job_id
         self.warehouse_id = warehouse_id
-    @property
+        self.pool_size = pool_size
+
+    @cached_property
     def full_table_name(self) -> str:
-        """Return the fully qualified table name with proper quoting for identifiers with special characters."""
+        """Return the fully qualified table name with proper quoting for identifiers with special characters.
+
+        Computed once per config instance; catalog, schema and table are fixed after connecting.
+        """
         # Quote catalog name if it contains hyphens or other special characters
         catalog = f"`{self.catalog}`" if "-" in self.catalog else self.catalog
         # Quote schema name if it contains hyphens or other special characters
@@ -26,3 +38,13 @@ class AppConfig:
         table = f"`{self.table}`" if "-" in self.table else self.table
         
         return f"{catalog}.{schema}.{table}"
+
+    @cached_property
+    def hostname(self) -> str:
+        """Return the workspace host without scheme or path (http:// and https:// alike), keeping any port."""
+        return (urlsplit(self.host).netloc or self.host).strip("/")
+
+    @cached_property
+    def http_path(self) -> str:
+        """Return the SQL warehouse HTTP path; the "auto" warehouse when no warehouse_id is set."""
+        return f"sql/1.0/warehouses/{self.warehouse_id}" if self.warehouse_id else "sql/1.0/warehouses/auto"
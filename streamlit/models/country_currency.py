@@ -4,6 +4,16 @@ Country-Currency data model classes.
 
 class CountryCurrency:
     """Model class for a country-currency record."""
+
+    # Explicit slots keep instances free of a per-object __dict__
+    __slots__ = (
+        'country_code',
+        'country_number',
+        'country',
+        'currency_name',
+        'currency_code',
+        'currency_number'
+    )
     
     def __init__(
         self,
@@ -3,10 +3,72 @@ Data operations module for performing CRUD operations on country-currency data.
 """
 import logging
 from utils.databricks_client import DatabricksClient
+from models.country_currency import CountryCurrency
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
+# SQL templates, formatted with the table name once per DataOperations instance
+SELECT_ALL_SQL = "SELECT * FROM {table} ORDER BY country_code"
+SELECT_FILTERED_SQL = (
+    "SELECT * FROM {table} WHERE LOWER(country) LIKE ? OR LOWER(country_code) LIKE ? "
+    "OR LOWER(currency_name) LIKE ? OR LOWER(currency_code) LIKE ? ORDER BY country_code"
+)
+SELECT_BY_ID_SQL = "SELECT * FROM {table} WHERE country_code = ?"
+INSERT_SQL = """
+        INSERT INTO {table} (
+            country_code, country_number, country, currency_name, currency_code, currency_number
+        ) VALUES (?, ?, ?, ?, ?, ?)
+        """
+UPDATE_SQL = """
+        UPDATE {table}
+        SET country_number = ?,
+            country = ?,
+            currency_name = ?,
+            currency_code = ?,
+            currency_number = ?
+        WHERE country_code = ?
+        """
+INSERT_MANY_SQL = (
+    "INSERT INTO {table} (country_code, country_number, country, currency_name, currency_code, currency_number) "
+    "VALUES "
+)
+INSERT_ROW_PLACEHOLDERS = "(?, ?, ?, ?, ?, ?)"
+UPSERT_MANY_HEAD_SQL = "MERGE INTO {table} AS t USING (SELECT * FROM VALUES "
+UPSERT_MANY_TAIL_SQL = (
+    " AS v(country_code, country_number, country, currency_name, currency_code, currency_number)) AS s "
+    "ON t.country_code = s.country_code "
+    "WHEN MATCHED THEN UPDATE SET t.country_number = s.country_number, t.country = s.country, "
+    "t.currency_name = s.currency_name, t.currency_code = s.currency_code, t.currency_number = s.currency_number "
+    "WHEN NOT MATCHED THEN INSERT (country_code, country_number, country, currency_name, currency_code, currency_number) "
+    "VALUES (s.country_code, s.country_number, s.country, s.currency_name, s.currency_code, s.currency_number)"
+)
+DELETE_SQL = "DELETE FROM {table} WHERE country_code = ?"
+COUNT_SQL = "SELECT COUNT(*) as count FROM {table}"
+
+# Maximum rows per multi-row INSERT/MERGE statement, keeps the bound parameter count bounded
+BULK_INSERT_BATCH_SIZE = 500
+
+
+def escape_like(text: str) -> str:
+    """Escape the LIKE wildcards (and the escape character) in `text`, so it matches literally."""
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def contains_pattern(text: str) -> str:
+    """Build a LIKE pattern matching `text` anywhere, with LIKE wildcards in `text` escaped."""
+    return f"%{escape_like(text)}%"
+
+
+def _flatten_records(records: list) -> tuple:
+    """Flatten records into one parameter tuple matching INSERT_ROW_PLACEHOLDERS order."""
+    return tuple(
+        value
+        for r in records
+        for value in (r.country_code, r.country_number, r.country,
+                      r.currency_name, r.currency_code, r.currency_number)
+    )
+
 
 class DataOperations:
     """Class for handling CRUD operations on the country-currency data."""
@@ -16,33 +78,49 @@ class DataOperations:
         self.client = client
         self.table_name = client.config.full_table_name
 
+        # Pre-format the SQL statements for this table
+        table = self.table_name
+        self._select_all = SELECT_ALL_SQL.format(table=table)
+        self._select_filtered = SELECT_FILTERED_SQL.format(table=table)
+        self._select_by_id = SELECT_BY_ID_SQL.format(table=table)
+        self._insert = INSERT_SQL.format(table=table)
+        self._insert_many = INSERT_MANY_SQL.format(table=table)
+        self._upsert_many_head = UPSERT_MANY_HEAD_SQL.format(table=table)
+        self._update = UPDATE_SQL.format(table=table)
+        self._delete = DELETE_SQL.format(table=table)
+        self._count = COUNT_SQL.format(table=table)
+
     def get_all_records(self, filter_query: str = None) -> list:
-        """Get all records from the country-currency table."""
-        try:
-            query = f"SELECT * FROM {self.table_name}"
-            if filter_query:
-                query += f" WHERE LOWER(country) LIKE LOWER('%{filter_query}%') OR LOWER(country_code) LIKE LOWER('%{filter_query}%') " \
-                         f"OR LOWER(currency_name) LIKE LOWER('%{filter_query}%') OR LOWER(currency_code) LIKE LOWER('%{filter_query}%')"
-            query += " ORDER BY country_code"
+        """Get all records from the country-currency table.
 
+        A blank or whitespace-only filter returns the unfiltered table. The filter
+        text is lowercased here so the SQL only applies LOWER() to the columns;
+        functional indexes on LOWER(country) etc. can then be used if present.
+        """
+        try:
+            filter_query = (filter_query or "").strip().lower()
             logger.debug(f"Executing query to get all records with filter: {filter_query}")
-            result = self.client.execute_query(query)
+            if filter_query:
+                # Parameterized so the warehouse can reuse the plan and input is never spliced into SQL
+                pattern = contains_pattern(filter_query)
+                result = self.client.execute_query(self._select_filtered, (pattern, pattern, pattern, pattern))
+            else:
+                result = self.client.execute_query(self._select_all)
             logger.info(f"Retrieved {len(result)} records")
             return result
         except Exception as e:
             logger.error(f"Error retrieving records: {str(e)}")
             return []
 
-    def get_record_by_id(self, country_code: str) -> dict:
-        """Get a record by country code."""
+    def get_record_by_id(self, country_code: str) -> CountryCurrency:
+        """Get a record by country code as a CountryCurrency model, or None if not found."""
         try:
-            query = f"SELECT * FROM {self.table_name} WHERE country_code = ?"
             logger.debug(f"Executing query to get record by country_code: {country_code}")
-            result = self.client.execute_query(query, (country_code,))
+            result = self.client.execute_query(self._select_by_id, (country_code,))
 
             if result:
                 logger.info(f"Record found for country_code: {country_code}")
-                return result[0]
+                return CountryCurrency.from_dict(result[0])
             else:
                 logger.warning(f"No record found for country_code: {country_code}")
                 return None
@@ -62,25 +140,67 @@ class DataOperations:
         Returns:
             bool: True if the record was added successfully, False otherwise
         """
-        # Convert the CountryCurrency object to a dictionary
-        record_dict = {
-            'country_code': record.country_code,
-            'country_number': record.country_number,
-            'country': record.country,
-            'currency_name': record.currency_name,
-            'currency_code': record.currency_code,
-            'currency_number': record.currency_number
-        }
-        return self.create_record(record_dict)
+        return self.create_record(record.to_dict())
 
-    def create_record(self, record: dict) -> bool:
-        """Create a new country-currency record."""
-        query = f"""
-        INSERT INTO {self.table_name} (
-            country_code, country_number, country, currency_name, currency_code, currency_number
-        ) VALUES (?, ?, ?, ?, ?, ?)
+    def create_many(self, records: list) -> bool:
+        """Insert several country-currency records with multi-row INSERT statements.
+
+        Records are sent in batches of BULK_INSERT_BATCH_SIZE rows, so N records cost
+        one round-trip per batch instead of one per record.
+
+        Args:
+            records: List of CountryCurrency objects to insert
+
+        Returns:
+            bool: True if all records were inserted successfully, False otherwise
         """
+        if not records:
+            return True
 
+        try:
+            for start in range(0, len(records), BULK_INSERT_BATCH_SIZE):
+                batch = records[start:start + BULK_INSERT_BATCH_SIZE]
+                query = self._insert_many + ", ".join([INSERT_ROW_PLACEHOLDERS] * len(batch))
+                self.client.execute_query(query, _flatten_records(batch))
+            logger.info(f"Created {len(records)} records in bulk")
+            return True
+        except Exception as e:
+            logger.error(f"Error creating records in bulk: {str(e)}")
+            return False
+
+    def upsert_many(self, records: list) -> bool:
+        """Insert or update several country-currency records with MERGE statements.
+
+        Existing country codes are updated and new ones inserted, one round-trip per
+        batch of BULK_INSERT_BATCH_SIZE rows. Country codes must be unique within the
+        given records.
+
+        Args:
+            records: List of CountryCurrency objects to upsert
+
+        Returns:
+            bool: True if all records were written successfully, False otherwise
+        """
+        if not records:
+            return True
+
+        try:
+            for start in range(0, len(records), BULK_INSERT_BATCH_SIZE):
+                batch = records[start:start + BULK_INSERT_BATCH_SIZE]
+                query = (self._upsert_many_head
+                         + ", ".join([INSERT_ROW_PLACEHOLDERS] * len(batch))
+                         + UPSERT_MANY_TAIL_SQL)
+                result = self.client.execute_query(query, _flatten_records(batch))
+                if result:
+                    logger.info(f"Upsert metrics: {result[0]}")
+            logger.info(f"Upserted {len(records)} records in bulk")
+            return True
+        except Exception as e:
+            logger.error(f"Error upserting records in bulk: {str(e)}")
+            return False
+
+    def create_record(self, record: dict) -> bool:
+        """Create a new country-currency record."""
         params = (
             record['country_code'],
             record['country_number'],
@@ -91,7 +211,7 @@ class DataOperations:
         )
 
         try:
-            self.client.execute_query(query, params)
+            self.client.execute_query(self._insert, params)
             logger.info(f"Record created successfully: {record['country_code']}")
             return True
         except Exception as e:
@@ -105,35 +225,10 @@ class DataOperations:
         """
         # Check if we got a CountryCurrency object and convert it to dict if needed
         if not isinstance(record, dict):
-            record_dict = {
-                'country_code': record.country_code,
-                'country_number': record.country_number,
-                'country': record.country,
-                'currency_name': record.currency_name,
-                'currency_code': record.currency_code,
-                'currency_number': record.currency_number
-            }
+            record_dict = record.to_dict()
         else:
             record_dict = record
 
-        # Check if the record exists before updating
-        check_query = f"SELECT COUNT(*) as count FROM {self.table_name} WHERE country_code = ?"
-        check_result = self.client.execute_query(check_query, (record_dict['country_code'],))
-
-        if not check_result or check_result[0]['count'] == 0:
-            logger.warning(f"Cannot update: Record with country_code {record_dict['country_code']} does not exist")
-            return False
-
-        query = f"""
-        UPDATE {self.table_name}
-        SET country_number = ?,
-            country = ?,
-            currency_name = ?,
-            currency_code = ?,
-            currency_number = ?
-        WHERE country_code = ?
-        """
-
         params = (
             record_dict['country_number'],
             record_dict['country'],
@@ -146,18 +241,20 @@ class DataOperations:
         try:
             logger.debug(f"Executing update query for country_code: {record_dict['country_code']}")
             logger.debug(f"Update parameters: {params}")
-            self.client.execute_query(query, params)
+            result = self.client.execute_query(self._update, params)
 
-            # Check if the update was successful
-            verify_query = f"SELECT * FROM {self.table_name} WHERE country_code = ?"
-            verify_result = self.client.execute_query(verify_query, (record_dict['country_code'],))
+            # Databricks reports DML metrics as a result row, so the affected-row count
+            # tells us both whether the record existed and whether the update applied
+            affected = result[0].get('num_affected_rows') if result else None
+            if affected is None:
+                # Metrics not reported by the endpoint - fall back to verifying the record
+                affected = len(self.client.execute_query(self._select_by_id, (record_dict['country_code'],)))
 
-            if verify_result:
+            if affected:
                 logger.info(f"Update successful for country_code: {record_dict['country_code']}")
                 return True
             else:
-                logger.warning(
-                    f"Update may have failed, could not verify record in database for country_code: {record_dict['country_code']}")
+                logger.warning(f"Cannot update: Record with country_code {record_dict['country_code']} does not exist")
                 return False
 
         except Exception as e:
@@ -167,10 +264,8 @@ class DataOperations:
 
     def delete_record(self, country_code: str) -> bool:
         """Delete a country-currency record by country code."""
-        query = f"DELETE FROM {self.table_name} WHERE country_code = ?"
-
         try:
-            self.client.execute_query(query, (country_code,))
+            self.client.execute_query(self._delete, (country_code,))
             logger.info(f"Record deleted successfully: {country_code}")
             return True
         except Exception as e:
@@ -180,9 +275,8 @@ class DataOperations:
     def count_records(self) -> int:
         """Count the total number of records in the country-currency table."""
         try:
-            query = f"SELECT COUNT(*) as count FROM {self.table_name}"
             logger.debug("Executing query to count records")
-            result = self.client.execute_query(query)
+            result = self.client.execute_query(self._count)
 
             if result:
                 count = result[0]['count']
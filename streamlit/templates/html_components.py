@@ -1,118 +1,154 @@
 # File: templates/html_components.py
+import textwrap
 
-def app_header(title="Country Currency Management", 
-               subtitle="A comprehensive system for managing country and currency mappings"):
-    """Render the application header"""
-    return f"""
+# Static HTML fragments, built once at import time
+CARD_START = '<div class="card">'
+CARD_END = '</div>'
+DATAFRAME_CONTAINER_END = '</div>'
+
+DELETE_WARNING = """
+    <div class="warning-message">
+        <strong>Warning:</strong> Deleting an entry is permanent and cannot be undone.
+    </div>
+    """
+
+DELETE_CONFIRMATION = """
+    <div class="confirmation-message">
+        <strong>Confirmation Required</strong>
+        <p>Please confirm that you want to permanently delete this entry.</p>
+    </div>
+    """
+
+LOADER = """
+    <div class="loader-container">
+        <div class="loader"></div>
+        <p>Loading data...</p>
+    </div>
+    """
+
+# Templates for the parameterized fragments
+_APP_HEADER_TMPL = """
     <h1>
-        <span style="color: #4da6ff;">🌎</span> 
+        <span style="color: #4da6ff;">🌎</span>
         {title}
     </h1>
-    
+
     <p style="text-align: center; margin-bottom: 30px;">
         {subtitle}
     </p>
     """
 
-def section_header(icon, title):
-    """Render a section header with icon"""
-    return f"""
+_SECTION_HEADER_TMPL = """
     <div class="section-header">
         <div class="section-header-icon">{icon}</div>
         <h2>{title}</h2>
     </div>
     """
 
+_FIELD_LABEL_TMPL = '<div class="field-label">{label}</div>'
+_FIELD_HELP_TMPL = '<div class="field-help">{help_text}</div>'
+
+_TOOLTIP_FIELD_TMPL = """
+    <div class="tooltip">{label}
+        <span class="tooltiptext">{tooltip_text}</span>
+    </div>
+    """
+
+_SUCCESS_MESSAGE_TMPL = """
+    <div class="success-message">
+        <strong>Success!</strong> {message}
+    </div>
+    """
+
+_ERROR_MESSAGE_TMPL = """
+    <div class="error-message">
+        <strong>Error!</strong> {message}
+    </div>
+    """
+
+_DATAFRAME_CONTAINER_START_TMPL = '<div class="dataframe-container" style="{style}">'
+
+_FOOTER_TMPL = """
+    <div style="text-align: center; margin-top: 50px; padding-top: 20px; border-top: 1px solid #444444;">
+        <p style="color: #7f8c8d; font-size: 14px;">
+            Country Currency Database © 2025 | Built with Streamlit
+            <span style="color: #4da6ff;">{version}</span>
+        </p>
+    </div>
+    """
+
+_INFO_BOX_TMPL = """
+    <div class="info-box">
+        <div class="info-box-title">{title}</div>
+        <div class="info-box-content">{message}</div>
+    </div>
+    """
+
+def join_html(*fragments):
+    """Join HTML fragments into one block so they can be rendered with a single call"""
+    return "\n".join(textwrap.dedent(fragment).strip() for fragment in fragments)
+
+def app_header(title="Country Currency Management",
+               subtitle="A comprehensive system for managing country and currency mappings"):
+    """Render the application header"""
+    return _APP_HEADER_TMPL.format(title=title, subtitle=subtitle)
+
+def section_header(icon, title):
+    """Render a section header with icon"""
+    return _SECTION_HEADER_TMPL.format(icon=icon, title=title)
+
 def card_start():
     """Start a card container"""
-    return '<div class="card">'
+    return CARD_START
 
 def card_end():
     """End a card container"""
-    return '</div>'
+    return CARD_END
 
 def field_label(label, help_text=None):
     """Render a field label with optional help text"""
-    html = f'<div class="field-label">{label}</div>'
+    html = _FIELD_LABEL_TMPL.format(label=label)
     if help_text:
-        html += f'<div class="field-help">{help_text}</div>'
+        html += _FIELD_HELP_TMPL.format(help_text=help_text)
     return html
 
 def tooltip_field(label, tooltip_text):
     """Render a field with tooltip"""
-    return f"""
-    <div class="tooltip">{label}
-        <span class="tooltiptext">{tooltip_text}</span>
-    </div>
-    """
+    return _TOOLTIP_FIELD_TMPL.format(label=label, tooltip_text=tooltip_text)
 
 def success_message(message):
     """Render a success message"""
-    return f"""
-    <div class="success-message">
-        <strong>Success!</strong> {message}
-    </div>
-    """
+    return _SUCCESS_MESSAGE_TMPL.format(message=message)
 
 def error_message(message):
     """Render an error message"""
-    return f"""
-    <div class="error-message">
-        <strong>Error!</strong> {message}
-    </div>
-    """
+    return _ERROR_MESSAGE_TMPL.format(message=message)
 
 def dataframe_container_start(border_color=None):
     """Start a dataframe container with optional border color"""
     style = f'border: 2px solid {border_color};' if border_color else ''
-    return f'<div class="dataframe-container" style="{style}">'
+    return _DATAFRAME_CONTAINER_START_TMPL.format(style=style)
 
 def dataframe_container_end():
     """End a dataframe container"""
-    return '</div>'
+    return DATAFRAME_CONTAINER_END
 
 def footer(version="v1.0.0"):
     """Render the application footer"""
-    return f"""
-    <div style="text-align: center; margin-top: 50px; padding-top: 20px; border-top: 1px solid #444444;">
-        <p style="color: #7f8c8d; font-size: 14px;">
-            Country Currency Database © {2025} | Built with Streamlit 
-            <span style="color: #4da6ff;">{version}</span>
-        </p>
-    </div>
-    """
+    return _FOOTER_TMPL.format(version=version)
 
 def delete_warning():
     """Render a delete warning message"""
-    return """
-    <div class="warning-message">
-        <strong>Warning:</strong> Deleting an entry is permanent and cannot be undone.
-    </div>
-    """
+    return DELETE_WARNING
 
 def delete_confirmation():
     """Render a delete confirmation message"""
-    return """
-    <div class="confirmation-message">
-        <strong>Confirmation Required</strong>
-        <p>Please confirm that you want to permanently delete this entry.</p>
-    </div>
-    """
+    return DELETE_CONFIRMATION
 
 def info_box(message, title="Information"):
     """Render an info box"""
-    return f"""
-    <div class="info-box">
-        <div class="info-box-title">{title}</div>
-        <div class="info-box-content">{message}</div>
-    </div>
-    """
+    return _INFO_BOX_TMPL.format(title=title, message=message)
 
 def loader():
     """Render a loading spinner"""
-    return """
-    <div class="loader-container">
-        <div class="loader"></div>
-        <p>Loading data...</p>
-    </div>
-    """
+    return LOADER
@@ -4,35 +4,30 @@ This module provides functionality to upload multiple country-currency mappings
 """
 import streamlit as st
 import pandas as pd
+import numpy as np
 import io
+import itertools
 import logging
-import time
-from operations.data_operations import DataOperations
+import textwrap
+from operations.data_operations import BULK_INSERT_BATCH_SIZE
 from models.country_currency import CountryCurrency
 from templates.html_components import (
+    CARD_START,
+    CARD_END,
     section_header, 
-    card_start, 
-    card_end, 
     field_label,
-    success_message,
     error_message,
     info_box
 )
-from utils.app_utils import refresh_data
+from utils.app_utils import get_data_operations, refresh_data
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
-def render_batch_upload_view():
-    """Render the batch upload view."""
-    if not st.session_state.authenticated:
-        return
-    
-    st.markdown(section_header("📤", "Batch Upload Country-Currency Mappings"), unsafe_allow_html=True)
-    st.markdown(card_start(), unsafe_allow_html=True)
-    
-    # Instructions
-    st.markdown("""
+# Static content for this view, rendered once at import time
+BATCH_UPLOAD_HEADER = section_header("📤", "Batch Upload Country-Currency Mappings")
+
+UPLOAD_INSTRUCTIONS = """
     ### Upload Instructions
     
     Upload a CSV file containing multiple country-currency mappings. The file should have the following columns:
@@ -50,22 +45,94 @@ def render_batch_upload_view():
     USA,United States,840,USD,US Dollar,840
     CAN,Canada,124,CAD,Canadian Dollar,124
     ```
-    """)
+"""
+
+# Blank lines keep the HTML blocks from swallowing the markdown that follows
+BATCH_UPLOAD_INTRO = "\n\n".join(
+    textwrap.dedent(part).strip() for part in (BATCH_UPLOAD_HEADER, CARD_START, UPLOAD_INSTRUCTIONS)
+)
+
+# Columns every uploaded file must contain
+REQUIRED_COLUMNS = ['country_code', 'country', 'currency_code', 'currency_name']
+
+# Files larger than this stop validating at the first failing check
+FAIL_FAST_ROW_THRESHOLD = 10_000
+
+# Uploads above this size are parsed and processed in chunks instead of all at once
+STREAMING_THRESHOLD_BYTES = 20 * 1024 * 1024
+UPLOAD_CHUNK_SIZE = 50_000
+
+def read_csv_upload(uploaded_file):
+    """
+    Read an uploaded CSV file into a DataFrame using the multi-threaded pyarrow parser.
+    
+    Falls back to the default C parser when pyarrow (or a pandas version supporting
+    the pyarrow backend) is not available.
+    
+    Args:
+        uploaded_file: File-like object returned by st.file_uploader
+        
+    Returns:
+        pandas.DataFrame: The parsed data
+    """
+    try:
+        return pd.read_csv(uploaded_file, engine='pyarrow', dtype_backend='pyarrow')
+    except (ImportError, TypeError, ValueError) as e:
+        logger.debug(f"pyarrow CSV engine unavailable, using default parser: {str(e)}")
+        uploaded_file.seek(0)
+        return pd.read_csv(uploaded_file)
+
+def iter_csv_upload(uploaded_file, chunksize=UPLOAD_CHUNK_SIZE):
+    """
+    Yield an uploaded CSV file as one or more DataFrames.
+    
+    Small files are parsed in one go with read_csv_upload. Files larger than
+    STREAMING_THRESHOLD_BYTES are streamed in chunks of `chunksize` rows so memory
+    stays bounded by the chunk size rather than the file size.
+    
+    Args:
+        uploaded_file: File-like object returned by st.file_uploader
+        chunksize (int): Rows per chunk when streaming
+        
+    Yields:
+        pandas.DataFrame: The next block of rows, with a continuous RangeIndex
+    """
+    uploaded_file.seek(0)
+    if uploaded_file.size <= STREAMING_THRESHOLD_BYTES:
+        yield read_csv_upload(uploaded_file)
+        return
+    
+    # The pyarrow engine doesn't support chunked reads, so stream with the C parser
+    with pd.read_csv(uploaded_file, chunksize=chunksize) as reader:
+        yield from reader
+
+def render_batch_upload_view():
+    """Render the batch upload view."""
+    if not st.session_state.authenticated:
+        return
+    
+    # Header, card opening and instructions go out as a single markdown element
+    st.markdown(BATCH_UPLOAD_INTRO, unsafe_allow_html=True)
+    
     
     # File upload
     uploaded_file = st.file_uploader("Choose a CSV file", type="csv")
     
     if uploaded_file is not None:
         try:
-            # Read the CSV file
-            df = pd.read_csv(uploaded_file)
+            # Validate the file chunk by chunk, keeping only the first chunk for the preview
+            preview = None
+            validation_errors = {}
+            for chunk in iter_csv_upload(uploaded_file):
+                if preview is None:
+                    # Send a standalone copy so only the preview rows are serialized
+                    preview = chunk.head(10).reset_index(drop=True).copy()
+                # Chunks can report the same problem; keep each message once, in order
+                validation_errors.update(dict.fromkeys(validate_upload_data(chunk)))
             
             # Display the uploaded data
             st.subheader("Preview of uploaded data")
-            st.dataframe(df.head(10), use_container_width=True)
-            
-            # Validate the data
-            validation_errors = validate_upload_data(df)
+            st.dataframe(preview, use_container_width=True)
             
             if validation_errors:
                 # Display validation errors
@@ -76,7 +143,15 @@ def render_batch_upload_view():
                 # Process the data
                 if st.button("Process Upload"):
                     with st.spinner("Processing upload..."):
-                        success_count, error_count, errors = process_upload(df)
+                        success_count, error_count, errors = 0, 0, []
+                        progress = st.progress(0.0)
+                        for chunk in iter_csv_upload(uploaded_file):
+                            chunk_success, chunk_errors, chunk_error_details = process_upload(chunk, row_offset=chunk.index[0] if len(chunk) else 0)
+                            success_count += chunk_success
+                            error_count += chunk_errors
+                            errors.extend(chunk_error_details)
+                            progress.progress(min(uploaded_file.tell() / max(uploaded_file.size, 1), 1.0))
+                        progress.empty()
                         
                         if error_count > 0:
                             st.markdown(error_message(f"Upload completed with {error_count} errors. {success_count} records were successfully processed."), unsafe_allow_html=True)
@@ -84,14 +159,12 @@ def render_batch_upload_view():
                             for i, error in enumerate(errors):
                                 st.markdown(f"**Row {error['row']}**: {error['message']}")
                         else:
-                            st.markdown(success_message(f"Successfully uploaded {success_count} records."), unsafe_allow_html=True)
                             # Refresh data
                             refresh_data(reset_page=True, show_message=False)
                             
-                            # Return to home view after a short delay
-                            time_placeholder = st.empty()
-                            time_placeholder.text("Redirecting to home view in 3 seconds...")
-                            time.sleep(3)
+                            # Return to home view right away; the toast carries the
+                            # success message without blocking the script thread
+                            st.toast(f"Successfully uploaded {success_count} records.", icon="✅")
                             st.session_state.current_view = "home"
                             st.rerun()
         
@@ -104,14 +177,36 @@ def render_batch_upload_view():
         st.session_state.current_view = "home"
         st.rerun()
     
-    st.markdown(card_end(), unsafe_allow_html=True)
+    st.markdown(CARD_END, unsafe_allow_html=True)
+
+def valid_code_mask(column):
+    """
+    Check which values are ISO-style codes: exactly three uppercase ASCII letters.
+    
+    Equivalent to matching r'^[A-Z]{3}$', but done on a fixed-width NumPy view of
+    the code points, so the whole column is checked without the regex engine.
+    Missing values are invalid.
+    
+    Args:
+        column (pandas.Series): The column to check
+        
+    Returns:
+        numpy.ndarray: Boolean mask, True where the value is a valid code
+    """
+    values = np.asarray(column.astype(str).to_numpy(), dtype=str)
+    # Truncate/pad to three UCS-4 code points; shorter values are zero-padded and fail the range check
+    code_points = values.astype('U3').view(np.uint32).reshape(-1, 3)
+    letters = ((code_points >= ord('A')) & (code_points <= ord('Z'))).all(axis=1)
+    return letters & (np.char.str_len(values) == 3)
 
-def validate_upload_data(df):
+def validate_upload_data(df, fail_fast=None):
     """
     Validate the uploaded data.
     
     Args:
         df (pandas.DataFrame): The dataframe containing the uploaded data
+        fail_fast (bool): Stop at the first failing check instead of running them all.
+            Defaults to True for files larger than FAIL_FAST_ROW_THRESHOLD rows.
         
     Returns:
         list: A list of validation error messages
@@ -119,8 +214,7 @@ def validate_upload_data(df):
     errors = []
     
     # Check required columns
-    required_columns = ['country_code', 'country', 'currency_code', 'currency_name']
-    for col in required_columns:
+    for col in REQUIRED_COLUMNS:
         if col not in df.columns:
             errors.append(f"Missing required column: {col}")
     
@@ -128,113 +222,140 @@ def validate_upload_data(df):
     if errors:
         return errors
     
+    if fail_fast is None:
+        fail_fast = len(df) > FAIL_FAST_ROW_THRESHOLD
+    
+    # Checks run lazily, so fail-fast mode skips every column after the first failure
+    checks = _iter_validation_errors(df)
+    if fail_fast:
+        return list(itertools.islice(checks, 1))
+    return list(checks)
+
+def _iter_validation_errors(df):
+    """
+    Yield validation error messages for the uploaded data, one check at a time.
+    
+    Args:
+        df (pandas.DataFrame): The dataframe containing the uploaded data, with all
+            required columns present
+        
+    Yields:
+        str: A validation error message
+    """
     # Check for empty values in required columns
-    for col in required_columns:
+    for col in REQUIRED_COLUMNS:
         if df[col].isnull().any():
-            errors.append(f"Column {col} contains empty values")
+            yield f"Column {col} contains empty values"
     
     # Validate country_code format (3 uppercase letters)
-    invalid_country_codes = df[~df['country_code'].str.match(r'^[A-Z]{3}$', na=False)]
-    if not invalid_country_codes.empty:
-        errors.append(f"Invalid country codes found. Country codes must be exactly 3 uppercase letters.")
+    # Checks reduce boolean masks directly instead of materializing the invalid rows
+    if not valid_code_mask(df['country_code']).all():
+        yield f"Invalid country codes found. Country codes must be exactly 3 uppercase letters."
         
     # Validate currency_code format (3 uppercase letters)
-    invalid_currency_codes = df[~df['currency_code'].str.match(r'^[A-Z]{3}$', na=False)]
-    if not invalid_currency_codes.empty:
-        errors.append(f"Invalid currency codes found. Currency codes must be exactly 3 uppercase letters.")
+    if not valid_code_mask(df['currency_code']).all():
+        yield f"Invalid currency codes found. Currency codes must be exactly 3 uppercase letters."
     
-    # Validate country name length
-    invalid_country_names = df[(df['country'].str.len() < 2) | (df['country'].str.len() > 100)]
-    if not invalid_country_names.empty:
-        errors.append(f"Invalid country names found. Country names must be between 2 and 100 characters.")
+    # Validate country name length (lengths computed once per column)
+    country_lengths = df['country'].str.len()
+    if ((country_lengths < 2) | (country_lengths > 100)).any():
+        yield f"Invalid country names found. Country names must be between 2 and 100 characters."
     
     # Validate currency name length
-    invalid_currency_names = df[(df['currency_name'].str.len() < 2) | (df['currency_name'].str.len() > 100)]
-    if not invalid_currency_names.empty:
-        errors.append(f"Invalid currency names found. Currency names must be between 2 and 100 characters.")
+    currency_name_lengths = df['currency_name'].str.len()
+    if ((currency_name_lengths < 2) | (currency_name_lengths > 100)).any():
+        yield f"Invalid currency names found. Currency names must be between 2 and 100 characters."
     
     # Validate numeric fields if present
     if 'country_number' in df.columns:
         if not pd.to_numeric(df['country_number'], errors='coerce').notnull().all():
-            errors.append("Invalid country numbers found. Country numbers must be numeric.")
+            yield "Invalid country numbers found. Country numbers must be numeric."
     
     if 'currency_number' in df.columns:
         if not pd.to_numeric(df['currency_number'], errors='coerce').notnull().all():
-            errors.append("Invalid currency numbers found. Currency numbers must be numeric.")
+            yield "Invalid currency numbers found. Currency numbers must be numeric."
+
+def coerce_numeric_columns(df):
+    """
+    Coerce the optional numeric columns to integers in one vectorized pass.
+    
+    Missing columns are added and invalid or empty values default to 0, so the
+    row loops that follow never need per-cell conversions.
     
-    return errors
+    Args:
+        df (pandas.DataFrame): The uploaded data, modified in place
+        
+    Returns:
+        pandas.DataFrame: The same dataframe, for chaining
+    """
+    for col in ('country_number', 'currency_number'):
+        if col not in df.columns:
+            df[col] = 0
+        else:
+            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0).astype(int)
+    return df
 
-def process_upload(df):
+def process_upload(df, row_offset=0):
     """
     Process the uploaded data and insert/update records.
     
     Args:
         df (pandas.DataFrame): The dataframe containing the validated data
+        row_offset (int): Position of the first row of `df` in the uploaded file,
+            used for error row numbers when the file is processed in chunks
         
     Returns:
         tuple: (success_count, error_count, errors)
     """
-    operations = DataOperations(st.session_state.databricks_client)
+    operations = get_data_operations()
     success_count = 0
     error_count = 0
     errors = []
     
     # Ensure numeric columns are properly formatted
-    if 'country_number' not in df.columns:
-        df['country_number'] = 0
-    else:
-        df['country_number'] = pd.to_numeric(df['country_number'], errors='coerce').fillna(0).astype(int)
-    
-    if 'currency_number' not in df.columns:
-        df['currency_number'] = 0
-    else:
-        df['currency_number'] = pd.to_numeric(df['currency_number'], errors='coerce').fillna(0).astype(int)
-    
-    # Process each row
-    for index, row in df.iterrows():
-        try:
-            # Create a CountryCurrency object
-            record = CountryCurrency(
-                country_code=row['country_code'],
-                country=row['country'],
-                country_number=row['country_number'],
-                currency_code=row['currency_code'],
-                currency_name=row['currency_name'],
-                currency_number=row['currency_number']
+    coerce_numeric_columns(df)
+    
+    # Build the records once from the column lists (tolist yields native Python scalars
+    # for the SQL parameters and avoids a Series or namedtuple per row).
+    # Rows are keyed by country code so a later duplicate overrides an earlier one,
+    # as it would when the rows were written one at a time. The overridden rows are
+    # remembered, so they are still counted (and reported) as rows of the file.
+    columns = ('country_code', 'country_number', 'country', 'currency_name', 'currency_code', 'currency_number')
+    records_by_code = {}
+    superseded_rows = {}
+    for row_number, values in enumerate(
+        zip(*(df[column].tolist() for column in columns)),
+        start=row_offset + 2  # +2 for 1-based indexing and header row
+    ):
+        previous = records_by_code.get(values[0])
+        if previous is not None:
+            superseded_rows.setdefault(values[0], []).append(previous[0])
+        records_by_code[values[0]] = (row_number, CountryCurrency(*values))
+    if superseded_rows:
+        logger.info(f"Batch upload: {sum(map(len, superseded_rows.values()))} rows overridden "
+                    f"by a later row with the same country code")
+    
+    # Upsert in batches: one MERGE round-trip per batch instead of a lookup plus a write per row
+    pending = list(records_by_code.values())
+    for start in range(0, len(pending), BULK_INSERT_BATCH_SIZE):
+        batch = pending[start:start + BULK_INSERT_BATCH_SIZE]
+        # Every file row behind the batch: the written rows plus the ones they overrode
+        batch_rows = [
+            (row, record)
+            for row_number, record in batch
+            for row in superseded_rows.get(record.country_code, []) + [row_number]
+        ]
+        if operations.upsert_many([record for _, record in batch]):
+            success_count += len(batch_rows)
+        else:
+            error_count += len(batch_rows)
+            errors.extend(
+                {
+                    'row': row_number,
+                    'message': f"Failed to upsert record for {record.country_code}"
+                }
+                for row_number, record in batch_rows
             )
-            
-            # Check if record already exists
-            existing_record = operations.get_record_by_id(row['country_code'])
-            
-            if existing_record:
-                # Update existing record
-                if operations.update_record(record):
-                    success_count += 1
-                    logger.info(f"Updated record for country_code: {row['country_code']}")
-                else:
-                    error_count += 1
-                    errors.append({
-                        'row': index + 2,  # +2 for 1-based indexing and header row
-                        'message': f"Failed to update record for {row['country_code']}"
-                    })
-            else:
-                # Create new record
-                if operations.add_record(record):
-                    success_count += 1
-                    logger.info(f"Created record for country_code: {row['country_code']}")
-                else:
-                    error_count += 1
-                    errors.append({
-                        'row': index + 2,
-                        'message': f"Failed to create record for {row['country_code']}"
-                    })
-        
-        except Exception as e:
-            error_count += 1
-            errors.append({
-                'row': index + 2,
-                'message': f"Error processing row: {str(e)}"
-            })
-            logger.error(f"Error processing row {index + 2}: {str(e)}")
-    
-    return success_count, error_count, errors
\ No newline at end of file
+    
+    logger.info(f"Batch upload processed: {success_count} succeeded, {error_count} failed")
+    return success_count, error_count, errors
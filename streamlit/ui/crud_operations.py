@@ -4,27 +4,53 @@ This module handles creating, reading, updating, and deleting records.
 """
 import streamlit as st
 import pandas as pd
-import time
 import tempfile
 import io
-from operations.data_operations import DataOperations
+from utils.app_utils import get_data_operations
+from operations.data_operations import BULK_INSERT_BATCH_SIZE
+from ui.batch_upload import coerce_numeric_columns, read_csv_upload
 from models.country_currency import CountryCurrency
 from templates.html_components import (
+    CARD_START,
+    CARD_END,
+    DELETE_WARNING,
+    DELETE_CONFIRMATION,
     section_header, 
-    card_start, 
-    card_end, 
     field_label,
     tooltip_field,
     success_message,
-    error_message,
-    delete_warning,
-    delete_confirmation
+    error_message
 )
 
+# Static HTML for these views, rendered once at import time
+ADD_RECORD_HEADER = section_header("➕", "Add New Country-Currency Mapping")
+BATCH_UPLOAD_HEADER = section_header("📤", "Batch Upload")
+
+# Upload template files are constant, so they are built once at import time
+TEMPLATE_DF = pd.DataFrame({
+    "country_code": ["USA", "GBR", "JPN"],
+    "country": ["United States of America", "United Kingdom", "Japan"],
+    "country_number": [840, 826, 392],
+    "currency_name": ["US Dollar", "Pound Sterling", "Japanese Yen"],
+    "currency_code": ["USD", "GBP", "JPY"],
+    "currency_number": [840, 826, 392]
+})
+
+TEMPLATE_CSV = TEMPLATE_DF.to_csv(index=False).encode("utf-8")
+
+def _build_excel_template():
+    """Serialize the upload template to Excel bytes."""
+    output = io.BytesIO()
+    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
+        TEMPLATE_DF.to_excel(writer, index=False, sheet_name="Template")
+    return output.getvalue()
+
+TEMPLATE_XLSX = _build_excel_template()
+
 def render_add_record_form():
     """Render the form for adding a new record."""
-    st.markdown(section_header("➕", "Add New Country-Currency Mapping"), unsafe_allow_html=True)
-    st.markdown(card_start(), unsafe_allow_html=True)
+    st.markdown(ADD_RECORD_HEADER, unsafe_allow_html=True)
+    st.markdown(CARD_START, unsafe_allow_html=True)
     
     with st.form("add_form"):
         col1, col2 = st.columns(2)
@@ -76,18 +102,16 @@ def render_add_record_form():
             
             # Save the new record
             try:
-                operations = DataOperations(st.session_state.databricks_client)
+                operations = get_data_operations()
                 operations.add_record(new_record)
-                st.markdown(success_message("Record added successfully."), unsafe_allow_html=True)
-                # Clear the form (by returning to home view after a short delay)
-                with st.spinner("Redirecting..."):
-                    time.sleep(2)
+                # Return to home view immediately; the toast survives the rerun
+                st.toast("Record added successfully.", icon="✅")
                 st.session_state.current_view = "home"
                 st.rerun()
             except Exception as e:
                 st.markdown(error_message(f"Error adding record: {str(e)}"), unsafe_allow_html=True)
     
-    st.markdown(card_end(), unsafe_allow_html=True)
+    st.markdown(CARD_END, unsafe_allow_html=True)
 
 def render_edit_record_form(record_id):
     """
@@ -103,7 +127,7 @@ def render_edit_record_form(record_id):
             st.rerun()
         return
     
-    operations = DataOperations(st.session_state.databricks_client)
+    operations = get_data_operations()
     record = operations.get_record_by_id(record_id)
     
     if not record:
@@ -113,11 +137,8 @@ def render_edit_record_form(record_id):
             st.rerun()
         return
     
-    # Convert dictionary to model
-    record = CountryCurrency.from_dict(record)
-    
     st.markdown(section_header("✏️", f"Edit Record: {record.country_code}"), unsafe_allow_html=True)
-    st.markdown(card_start(), unsafe_allow_html=True)
+    st.markdown(CARD_START, unsafe_allow_html=True)
     
     with st.form("edit_form"):
         col1, col2 = st.columns(2)
@@ -170,17 +191,15 @@ def render_edit_record_form(record_id):
             
             try:
                 operations.update_record(updated_record)
-                st.markdown(success_message("Record updated successfully."), unsafe_allow_html=True)
-                # Return to home view after a short delay
-                with st.spinner("Redirecting..."):
-                    time.sleep(2)
+                # Return to home view immediately; the toast survives the rerun
+                st.toast("Record updated successfully.", icon="✅")
                 st.session_state.current_view = "home"
                 st.session_state.edit_record_id = None
                 st.rerun()
             except Exception as e:
                 st.markdown(error_message(f"Error updating record: {str(e)}"), unsafe_allow_html=True)
     
-    st.markdown(card_end(), unsafe_allow_html=True)
+    st.markdown(CARD_END, unsafe_allow_html=True)
 
 def render_delete_record_form(record_id):
     """
@@ -196,7 +215,7 @@ def render_delete_record_form(record_id):
             st.rerun()
         return
     
-    operations = DataOperations(st.session_state.databricks_client)
+    operations = get_data_operations()
     record = operations.get_record_by_id(record_id)
     
     if not record:
@@ -206,11 +225,8 @@ def render_delete_record_form(record_id):
             st.rerun()
         return
     
-    # Convert dictionary to model
-    record = CountryCurrency.from_dict(record)
-    
     st.markdown(section_header("🗑️", f"Delete Record: {record.country_code}"), unsafe_allow_html=True)
-    st.markdown(card_start(), unsafe_allow_html=True)
+    st.markdown(CARD_START, unsafe_allow_html=True)
     
     # Display record information
     st.markdown(f"""
@@ -223,8 +239,8 @@ def render_delete_record_form(record_id):
     """, unsafe_allow_html=True)
     
     # Warning message
-    st.markdown(delete_warning(), unsafe_allow_html=True)
-    st.markdown(delete_confirmation(), unsafe_allow_html=True)
+    st.markdown(DELETE_WARNING, unsafe_allow_html=True)
+    st.markdown(DELETE_CONFIRMATION, unsafe_allow_html=True)
     
     col1, col2 = st.columns(2)
     
@@ -232,10 +248,8 @@ def render_delete_record_form(record_id):
         if st.button("Confirm Delete", key="confirm_delete_btn"):
             try:
                 operations.delete_record(record.country_code)
-                st.markdown(success_message("Record deleted successfully."), unsafe_allow_html=True)
-                # Return to home view after a short delay
-                with st.spinner("Redirecting..."):
-                    time.sleep(2)
+                # Return to home view immediately; the toast survives the rerun
+                st.toast("Record deleted successfully.", icon="✅")
                 st.session_state.current_view = "home"
                 st.session_state.delete_record_id = None
                 st.rerun()
@@ -248,12 +262,12 @@ def render_delete_record_form(record_id):
             st.session_state.delete_record_id = None
             st.rerun()
     
-    st.markdown(card_end(), unsafe_allow_html=True)
+    st.markdown(CARD_END, unsafe_allow_html=True)
 
 def render_batch_upload():
     """Render the interface for batch uploading records from a CSV or Excel file."""
-    st.markdown(section_header("📤", "Batch Upload"), unsafe_allow_html=True)
-    st.markdown(card_start(), unsafe_allow_html=True)
+    st.markdown(BATCH_UPLOAD_HEADER, unsafe_allow_html=True)
+    st.markdown(CARD_START, unsafe_allow_html=True)
     
     st.markdown("""
     Upload multiple records at once using a CSV or Excel file.
@@ -272,13 +286,14 @@ def render_batch_upload():
         try:
             # Determine file type
             if uploaded_file.name.endswith('.csv'):
-                df = pd.read_csv(uploaded_file)
+                df = read_csv_upload(uploaded_file)
             else:
                 df = pd.read_excel(uploaded_file)
             
             # Display preview
             st.subheader("Preview")
-            st.dataframe(df.head(5), use_container_width=True)
+            # Send a standalone copy so only the preview rows are serialized
+            st.dataframe(df.head(5).reset_index(drop=True).copy(), use_container_width=True)
             
             # Validate data
             required_columns = ['country_code', 'country', 'currency_name', 'currency_code']
@@ -287,38 +302,58 @@ def render_batch_upload():
             if missing_columns:
                 st.markdown(error_message(f"Missing required columns: {', '.join(missing_columns)}"), unsafe_allow_html=True)
             else:
-                # Convert NaN values to appropriate defaults
-                df['country_number'].fillna(0, inplace=True)
-                df['currency_number'].fillna(0, inplace=True)
+                # Convert NaN values to appropriate defaults (adds the optional numeric
+                # columns when the file doesn't have them)
+                coerce_numeric_columns(df)
                 
                 # Process upload
                 if st.button("Upload Records"):
                     with st.spinner("Uploading records..."):
-                        operations = DataOperations(st.session_state.databricks_client)
+                        operations = get_data_operations()
                         
                         # Process each record
                         success_count = 0
                         error_count = 0
                         errors = []
+                        records = []
                         
-                        for _, row in df.iterrows():
+                        # Convert whole columns up front so the loop only reads plain values
+                        columns = (
+                            df['country_code'].astype(str).str.upper().to_numpy(),
+                            df['country'].astype(str).to_numpy(),
+                            df['country_number'].to_numpy(),
+                            df['currency_code'].astype(str).str.upper().to_numpy(),
+                            df['currency_name'].astype(str).to_numpy(),
+                            df['currency_number'].to_numpy()
+                        )
+                        
+                        for i, (code, country, country_number, currency_code, currency_name, currency_number) in enumerate(zip(*columns)):
                             try:
                                 # Create record
                                 record = CountryCurrency(
-                                    country_code=str(row['country_code']).upper(),
-                                    country=str(row['country']),
-                                    country_number=int(row['country_number']) if 'country_number' in row and not pd.isna(row['country_number']) else 0,
-                                    currency_code=str(row['currency_code']).upper(),
-                                    currency_name=str(row['currency_name']),
-                                    currency_number=int(row['currency_number']) if 'currency_number' in row and not pd.isna(row['currency_number']) else 0
+                                    country_code=code,
+                                    country=country,
+                                    country_number=int(country_number),
+                                    currency_code=currency_code,
+                                    currency_name=currency_name,
+                                    currency_number=int(currency_number)
                                 )
-                                
-                                # Add record to database
-                                operations.add_record(record)
-                                success_count += 1
+                                records.append((i + 2, record))
                             except Exception as e:
                                 error_count += 1
-                                errors.append(f"Error on row {_+2}: {str(e)}")
+                                errors.append(f"Error on row {i+2}: {str(e)}")
+                        
+                        # Insert with multi-row INSERTs: one round-trip per batch instead of one per record
+                        for start in range(0, len(records), BULK_INSERT_BATCH_SIZE):
+                            batch = records[start:start + BULK_INSERT_BATCH_SIZE]
+                            if operations.create_many([record for _, record in batch]):
+                                success_count += len(batch)
+                            else:
+                                error_count += len(batch)
+                                errors.extend(
+                                    f"Error on row {row_number}: Failed to create record for {record.country_code}"
+                                    for row_number, record in batch
+                                )
                         
                         # Show results
                         st.markdown(f"""
@@ -347,47 +382,19 @@ def render_batch_upload():
     col1, col2 = st.columns(2)
     
     with col1:
-        if st.button("Download CSV Template"):
-            template_data = {
-                "country_code": ["USA", "GBR", "JPN"],
-                "country": ["United States of America", "United Kingdom", "Japan"],
-                "country_number": [840, 826, 392],
-                "currency_name": ["US Dollar", "Pound Sterling", "Japanese Yen"],
-                "currency_code": ["USD", "GBP", "JPY"],
-                "currency_number": [840, 826, 392]
-            }
-            df = pd.DataFrame(template_data)
-            csv = df.to_csv(index=False)
-            st.download_button(
-                label="Click to download",
-                data=csv,
-                file_name="country_currency_template.csv",
-                mime="text/csv"
-            )
+        st.download_button(
+            label="Download CSV Template",
+            data=TEMPLATE_CSV,
+            file_name="country_currency_template.csv",
+            mime="text/csv"
+        )
     
     with col2:
-        if st.button("Download Excel Template"):
-            template_data = {
-                "country_code": ["USA", "GBR", "JPN"],
-                "country": ["United States of America", "United Kingdom", "Japan"],
-                "country_number": [840, 826, 392],
-                "currency_name": ["US Dollar", "Pound Sterling", "Japanese Yen"],
-                "currency_code": ["USD", "GBP", "JPY"],
-                "currency_number": [840, 826, 392]
-            }
-            df = pd.DataFrame(template_data)
-            
-            # Create Excel in memory
-            output = io.BytesIO()
-            with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                df.to_excel(writer, index=False, sheet_name="Template")
-            excel_data = output.getvalue()
-            
-            st.download_button(
-                label="Click to download",
-                data=excel_data,
-                file_name="country_currency_template.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-            )
+        st.download_button(
+            label="Download Excel Template",
+            data=TEMPLATE_XLSX,
+            file_name="country_currency_template.xlsx",
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        )
     
-    st.markdown(card_end(), unsafe_allow_html=True)
+    st.markdown(CARD_END, unsafe_allow_html=True)
@@ -3,10 +3,10 @@ Data display component for the Streamlit application.
 This module handles fetching, displaying, and pagination of data from Unity Catalog.
 """
 import streamlit as st
-import pandas as pd
 import math
-from operations.data_operations import DataOperations
 from utils.databricks_client import DatabricksClient
+from operations.data_operations import contains_pattern
+from utils.app_utils import get_data_operations, get_record_count, run_cached_query
 from templates.html_components import (
     section_header, 
     card_start, 
@@ -14,9 +14,34 @@ from templates.html_components import (
     dataframe_container_start,
     dataframe_container_end,
     info_box,
-    loader
+    loader,
+    join_html
 )
 
+# Columns the data view may be ordered by
+SORTABLE_COLUMNS = frozenset([
+    "country",
+    "country_code",
+    "country_number",
+    "currency_name",
+    "currency_code",
+    "currency_number"
+])
+
+# Name of the window-count column added to each page query
+TOTAL_ROWS_COLUMN = "_total_rows"
+
+# Compact column dtypes for the displayed page; smaller Arrow payload to the frontend.
+# Nullable Int32 keeps NULL numbers working.
+DISPLAY_DTYPES = {
+    "country_code": "string[pyarrow]",
+    "country": "string[pyarrow]",
+    "country_number": "Int32",
+    "currency_code": "string[pyarrow]",
+    "currency_name": "string[pyarrow]",
+    "currency_number": "Int32"
+}
+
 def render_data_display(filter_query=None, sort_by=None, sort_ascending=True, page=1, rows_per_page=10):
     """
     Render the data display component with pagination, sorting, and filtering.
@@ -31,22 +56,29 @@ def render_data_display(filter_query=None, sort_by=None, sort_ascending=True, pa
     if not st.session_state.get("authenticated", False):
         return
     
-    st.markdown(section_header("📊", "Data Explorer"), unsafe_allow_html=True)
+    st.html(section_header("📊", "Data Explorer"))
     
     # Get data operations
     try:
-        operations = DataOperations(st.session_state.databricks_client)
+        operations = get_data_operations()
+        
+        # Table-wide count for the stats card (cached across reruns)
+        count_error = None
+        try:
+            total_records = get_record_count()
+        except Exception as e:
+            count_error = e
+            total_records = 0
         
         # Stats Card
-        st.markdown(card_start(), unsafe_allow_html=True)
+        st.html(card_start())
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            try:
-                total_records = operations.count_records()
+            if count_error is None:
                 st.metric("Total Records", f"{total_records:,}")
-            except Exception as e:
-                st.error(f"Error getting record count: {str(e)}")
+            else:
+                st.error(f"Error getting record count: {str(count_error)}")
         
         with col2:
             st.metric("Table Schema", st.session_state.databricks_client.config.schema)
@@ -54,14 +86,48 @@ def render_data_display(filter_query=None, sort_by=None, sort_ascending=True, pa
         with col3:
             st.metric("Table Name", st.session_state.databricks_client.config.table)
         
-        st.markdown(card_end(), unsafe_allow_html=True)
+        # Close the stats card and open the data card in one element
+        st.html(join_html(card_end(), dataframe_container_start()))
         
-        # Data Card
-        st.markdown(dataframe_container_start(), unsafe_allow_html=True)
+        # Get data with pagination
+        with st.spinner("Loading data..."):
+            offset = (page - 1) * rows_per_page
+            # COUNT(*) OVER () returns the number of matching rows alongside the page,
+            # so pagination needs no separate COUNT(*) round-trip
+            query = f"SELECT *, COUNT(*) OVER () AS {TOTAL_ROWS_COLUMN} FROM {operations.table_name}"
+            params = None
+            
+            # Add filtering with case-insensitive search; the search text is bound as a
+            # parameter so the SQL text (and its cached plan) is the same for every filter value.
+            # It is lowercased once here so the warehouse only applies LOWER() to the columns.
+            filter_query = (filter_query or "").strip().lower()
+            if filter_query:
+                query += " WHERE LOWER(country) LIKE ? OR LOWER(country_code) LIKE ? " \
+                         "OR LOWER(currency_name) LIKE ? OR LOWER(currency_code) LIKE ?"
+                pattern = contains_pattern(filter_query)
+                params = (pattern, pattern, pattern, pattern)
+            
+            # Add sorting; column names can't be bound, so only known columns are interpolated
+            if sort_by in SORTABLE_COLUMNS:
+                query += f" ORDER BY {sort_by} {'ASC' if sort_ascending else 'DESC'}"
+            else:
+                query += " ORDER BY country_code"
+                
+            # Add pagination
+            query += f" LIMIT {int(rows_per_page)} OFFSET {int(offset)}"
+            
+            # Served from the query cache when the same page was fetched before
+            data = run_cached_query(query, params)
         
-        # Set up pagination controls
-        total_records = operations.count_records()
-        total_pages = math.ceil(total_records / rows_per_page)
+        # A filter can leave fewer pages than the current one, and a page past the end comes
+        # back empty (so without a count); start again from the first page
+        if not data and page > 1:
+            st.session_state.current_page = 1
+            st.rerun()
+        
+        # Set up pagination controls from the matching row count
+        matching_records = data[0][TOTAL_ROWS_COLUMN] if data else 0
+        total_pages = math.ceil(matching_records / rows_per_page)
         
         # Pagination controls
         col1, col2, col3, col4 = st.columns([1, 1, 1, 1])
@@ -89,48 +155,32 @@ def render_data_display(filter_query=None, sort_by=None, sort_ascending=True, pa
         # Page indicator
         st.caption(f"Page {page} of {total_pages}")
         
-        # Get data with pagination
-        with st.spinner("Loading data..."):
-            offset = (page - 1) * rows_per_page
-            query = f"SELECT * FROM {operations.table_name}"
-            
-            # Add filtering with case-insensitive search
-            if filter_query:
-                query += f" WHERE LOWER(country) LIKE LOWER('%{filter_query}%') OR LOWER(country_code) LIKE LOWER('%{filter_query}%') " \
-                         f"OR LOWER(currency_name) LIKE LOWER('%{filter_query}%') OR LOWER(currency_code) LIKE LOWER('%{filter_query}%')"
-            
-            # Add sorting
-            if sort_by:
-                query += f" ORDER BY {sort_by} {'ASC' if sort_ascending else 'DESC'}"
-            else:
-                query += " ORDER BY country_code"
-                
-            # Add pagination
-            query += f" LIMIT {rows_per_page} OFFSET {offset}"
-            
-            data = operations.client.execute_query(query)
-            
-            if not data:
-                st.markdown(info_box("No data found. Try a different filter or add new entries."), unsafe_allow_html=True)
-                st.markdown(dataframe_container_end(), unsafe_allow_html=True)
-                return
-            
-            # Convert to pandas DataFrame for display
-            df = pd.DataFrame(data)
-            
-            # Display the data as an interactive table
-            st.dataframe(df, use_container_width=True, height=400)
-            
-            # Show record count
-            st.caption(f"Showing {len(df)} of {total_records:,} records")
+        if not data:
+            st.html(join_html(
+                info_box("No data found. Try a different filter or add new entries."),
+                dataframe_container_end()
+            ))
+            return
+        
+        # Convert to pandas DataFrame for display, without the helper count column
+        # (pandas is imported here so views that never render a table don't pay for it)
+        import pandas as pd
+        df = pd.DataFrame(data).drop(columns=[TOTAL_ROWS_COLUMN]).astype(DISPLAY_DTYPES)
+        
+        # Display the data as an interactive table
+        st.dataframe(df, use_container_width=True, height=400)
+        
+        # Show record count
+        st.caption(f"Showing {len(df)} of {matching_records:,} records")
             
-        st.markdown(dataframe_container_end(), unsafe_allow_html=True)
+        st.html(dataframe_container_end())
         
         # Table Schema Information
         with st.expander("Table Schema Information"):
             # Get column information
             table_schema = operations.get_table_schema()
             if table_schema:
+                import pandas as pd
                 schema_df = pd.DataFrame(table_schema)
                 st.dataframe(schema_df, use_container_width=True)
             else:
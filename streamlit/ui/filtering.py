@@ -3,8 +3,7 @@ Filtering and sorting component for the Streamlit application.
 This module handles all data filtering, searching, and sorting functionality.
 """
 import streamlit as st
-import pandas as pd
-from operations.data_operations import DataOperations
+from utils.app_utils import get_data_operations
 from templates.html_components import (
     section_header, 
     card_start, 
@@ -13,6 +12,17 @@ from templates.html_components import (
     tooltip_field
 )
 
+# Columns offered in the "Sort by" selectbox, with their positions for O(1) lookup
+SORT_OPTIONS = (
+    "country", 
+    "country_code", 
+    "country_number", 
+    "currency_name", 
+    "currency_code", 
+    "currency_number"
+)
+SORT_OPTION_INDEX = {option: i for i, option in enumerate(SORT_OPTIONS)}
+
 def render_filtering_controls():
     """
     Render the filtering and sorting controls.
@@ -20,19 +30,23 @@ def render_filtering_controls():
     Returns:
         tuple: filter_query, sort_by, sort_ascending
     """
-    st.markdown(card_start(), unsafe_allow_html=True)
+    st.html(card_start())
     
     # Use standard Streamlit components but adjust the layout
     col1, col2 = st.columns([3, 1])
     
     with col1:
-        # Add search label and text input
-        st.markdown(field_label("Search", "Filter by country, currency, or codes"), unsafe_allow_html=True)
-        filter_query = st.text_input(
-            "",
-            value=st.session_state.get("filter_query", ""),
-            placeholder="Type to search..."
-        )
+        # Add search label and text input. The input lives in a form so typing doesn't
+        # rerun the app (and query the warehouse) on every edit; the filter is applied
+        # when the user presses Enter or clicks Search.
+        st.html(field_label("Search", "Filter by country, currency, or codes"))
+        with st.form("search_form"):
+            filter_query = st.text_input(
+                "",
+                value=st.session_state.get("filter_query", ""),
+                placeholder="Type to search and press Enter..."
+            )
+            st.form_submit_button("🔍 Search")
         
         if "filter_query" not in st.session_state or filter_query != st.session_state.filter_query:
             st.session_state.filter_query = filter_query
@@ -53,13 +67,14 @@ def render_filtering_controls():
             refresh_data(reset_page=True, show_message=True)
             st.rerun()
     
-    # Advanced filtering (expandable)
-    with st.expander("Advanced Filtering"):
+    # Advanced filtering, only rendered (and queried) when the user opts in
+    advanced_open = st.checkbox("Show advanced filters", key="advanced_open")
+    if advanced_open:
         col1, col2 = st.columns(2)
         
         with col1:
             # Numeric Range filters
-            st.markdown(field_label("Country Number Range"), unsafe_allow_html=True)
+            st.html(field_label("Country Number Range"))
             country_num_min, country_num_max = st.slider(
                 "Country Number", 
                 min_value=0, 
@@ -67,7 +82,7 @@ def render_filtering_controls():
                 value=(0, 999)
             )
             
-            st.markdown(field_label("Currency Number Range"), unsafe_allow_html=True)
+            st.html(field_label("Currency Number Range"))
             currency_num_min, currency_num_max = st.slider(
                 "Currency Number", 
                 min_value=0, 
@@ -78,18 +93,18 @@ def render_filtering_controls():
         with col2:
             # Categorical filters
             try:
-                operations = DataOperations(st.session_state.databricks_client)
+                operations = get_data_operations()
                 
                 # Get unique regions for filtering (if available in dataset)
                 regions = operations.get_unique_values("region") if hasattr(operations, "get_unique_values") else []
                 if regions:
-                    st.markdown(field_label("Filter by Region"), unsafe_allow_html=True)
+                    st.html(field_label("Filter by Region"))
                     selected_regions = st.multiselect("", regions)
                 
                 # Get unique continents for filtering (if available in dataset)
                 continents = operations.get_unique_values("continent") if hasattr(operations, "get_unique_values") else []
                 if continents:
-                    st.markdown(field_label("Filter by Continent"), unsafe_allow_html=True)
+                    st.html(field_label("Filter by Continent"))
                     selected_continents = st.multiselect("", continents)
             except Exception as e:
                 st.warning(f"Could not load categorical filters: {str(e)}")
@@ -98,27 +113,18 @@ def render_filtering_controls():
     col1, col2 = st.columns(2)
     
     with col1:
-        sort_options = [
-            "country", 
-            "country_code", 
-            "country_number", 
-            "currency_name", 
-            "currency_code", 
-            "currency_number"
-        ]
-        
-        st.markdown(field_label("Sort by"), unsafe_allow_html=True)
+        st.html(field_label("Sort by"))
         sort_by = st.selectbox(
             "",
-            options=sort_options,
-            index=sort_options.index(st.session_state.get("sort_by", "country_code"))
+            options=SORT_OPTIONS,
+            index=SORT_OPTION_INDEX.get(st.session_state.get("sort_by"), SORT_OPTION_INDEX["country_code"])
         )
         
         if "sort_by" not in st.session_state or sort_by != st.session_state.sort_by:
             st.session_state.sort_by = sort_by
     
     with col2:
-        st.markdown(field_label("Sort direction"), unsafe_allow_html=True)
+        st.html(field_label("Sort direction"))
         sort_ascending = st.radio(
             "",
             options=["Ascending", "Descending"],
@@ -130,31 +136,31 @@ def render_filtering_controls():
         if "sort_ascending" not in st.session_state or sort_ascending != st.session_state.sort_ascending:
             st.session_state.sort_ascending = sort_ascending
     
-    st.markdown(card_end(), unsafe_allow_html=True)
+    st.html(card_end())
     
     # Construct the advanced filter query if needed
-    advanced_filter = ""
-    if "country_num_min" in locals() and "country_num_max" in locals():
+    advanced_conditions = []
+    if advanced_open:
         if country_num_min > 0 or country_num_max < 999:
-            advanced_filter += f" AND country_number BETWEEN {country_num_min} AND {country_num_max}"
+            advanced_conditions.append(f"country_number BETWEEN {country_num_min} AND {country_num_max}")
     
-    if "currency_num_min" in locals() and "currency_num_max" in locals():
         if currency_num_min > 0 or currency_num_max < 999:
-            advanced_filter += f" AND currency_number BETWEEN {currency_num_min} AND {currency_num_max}"
+            advanced_conditions.append(f"currency_number BETWEEN {currency_num_min} AND {currency_num_max}")
     
-    if "selected_regions" in locals() and selected_regions:
-        regions_str = ", ".join([f"'{region}'" for region in selected_regions])
-        advanced_filter += f" AND region IN ({regions_str})"
+        if "selected_regions" in locals() and selected_regions:
+            regions_str = ", ".join([f"'{region}'" for region in selected_regions])
+            advanced_conditions.append(f"region IN ({regions_str})")
     
-    if "selected_continents" in locals() and selected_continents:
-        continents_str = ", ".join([f"'{continent}'" for continent in selected_continents])
-        advanced_filter += f" AND continent IN ({continents_str})"
+        if "selected_continents" in locals() and selected_continents:
+            continents_str = ", ".join([f"'{continent}'" for continent in selected_continents])
+            advanced_conditions.append(f"continent IN ({continents_str})")
+    advanced_filter = " AND ".join(advanced_conditions)
     
     # Combine basic filter and advanced filter
     combined_filter = filter_query
     if advanced_filter and filter_query:
-        combined_filter = f"({filter_query}){advanced_filter}"
+        combined_filter = f"({filter_query}) AND {advanced_filter}"
     elif advanced_filter:
-        combined_filter = advanced_filter.strip(" AND ")
+        combined_filter = advanced_filter
     
     return combined_filter, sort_by, sort_ascending
@@ -6,8 +6,9 @@ import streamlit as st
 import pandas as pd
 import time
 import io
-import plotly.express as px
-from operations.data_operations import DataOperations
+from functools import lru_cache, partial
+from operations.data_operations import DataOperations, contains_pattern, escape_like
+from utils.app_utils import run_cached_query, run_cached_arrow_query
 from templates.html_components import (
     section_header, 
     card_start, 
@@ -44,8 +45,171 @@ def render_main_view():
     # Display footer
     st.markdown(footer(version="v1.0.0"), unsafe_allow_html=True)
 
+# Columns fetched for the explorer table, in display order
+EXPLORER_COLUMNS_SQL = ", ".join([
+    "country_code",
+    "country",
+    "country_number",
+    "currency_code",
+    "currency_name",
+    "currency_number"
+])
+
+# The searchable text columns as one string, for single-predicate contains searches
+SEARCH_BLOB_SQL = "concat_ws('\\n', country, country_code, currency_name, currency_code)"
+
+# Search conditions per search type, as (SQL, search text to parameter). ILIKE matches
+# case-insensitively without a LOWER() call per column and row. Contains searches match
+# once against the joined columns: the newline separator can't be typed into the
+# single-line search box, so a match never spans two columns. LIKE wildcards typed into
+# the search box are escaped, so they match literally.
+SEARCH_FILTERS = {
+    "contains": (f"{SEARCH_BLOB_SQL} ILIKE ?", contains_pattern),
+    "starts_with": (
+        "country ILIKE ? OR country_code ILIKE ? OR currency_name ILIKE ? OR currency_code ILIKE ?",
+        lambda text: f"{escape_like(text)}%"
+    ),
+    "exact": (
+        "LOWER(country) = LOWER(?) OR LOWER(country_code) = LOWER(?) OR "
+        "LOWER(currency_name) = LOWER(?) OR LOWER(currency_code) = LOWER(?)",
+        str
+    )
+}
+
+# Display settings for the explorer table; numeric ISO codes shown without separators
+EXPLORER_COLUMN_CONFIG = {
+    "country_number": st.column_config.NumberColumn(format="%d"),
+    "currency_number": st.column_config.NumberColumn(format="%d")
+}
+
+# Numeric columns summarized by the analytics dashboard
+ANALYTICS_NUMERIC_COLUMNS = ("country_number", "currency_number")
+
+# describe()-style statistics, as (row label, column alias suffix, SQL aggregate template)
+NUMERIC_SUMMARY_STATS = (
+    ("count", "count", "COUNT({column})"),
+    ("mean", "mean", "AVG({column})"),
+    ("std", "std", "STDDEV({column})"),
+    ("min", "min", "MIN({column})"),
+    ("25%", "p25", "percentile_approx({column}, 0.25)"),
+    ("50%", "p50", "percentile_approx({column}, 0.5)"),
+    ("75%", "p75", "percentile_approx({column}, 0.75)"),
+    ("max", "max", "MAX({column})")
+)
+
+# Histogram bins over the ISO numeric code range (0-999)
+HISTOGRAM_BINS = 20
+HISTOGRAM_RANGE_END = 1000
+HISTOGRAM_BIN_WIDTH = HISTOGRAM_RANGE_END // HISTOGRAM_BINS
+
+@lru_cache(maxsize=32)
+def _build_filters(search_query, search_type, country_num_range, currency_num_range):
+    """
+    Build the explorer WHERE conditions and their bound parameters.
+
+    Memoized on the filter inputs, so reruns that don't touch the filters reuse the result.
+
+    Args:
+        search_query (str): Search text ("" for no search)
+        search_type (str): "contains", "starts_with" or "exact"
+        country_num_range (tuple): (min, max) country number
+        currency_num_range (tuple): (min, max) currency number
+
+    Returns:
+        tuple: (conditions tuple, parameters tuple)
+    """
+    filters = []
+    query_params = []
+
+    if search_query and search_type in SEARCH_FILTERS:
+        # Build the filter string based on the search type
+        filter_str, to_param = SEARCH_FILTERS[search_type]
+        filters.append(f"({filter_str})")
+        query_params.extend([to_param(search_query)] * filter_str.count("?"))
+
+    # Add numeric range filters
+    if country_num_range[0] > 0 or country_num_range[1] < 999:
+        filters.append("country_number BETWEEN ? AND ?")
+        query_params.extend([country_num_range[0], country_num_range[1]])
+
+    if currency_num_range[0] > 0 or currency_num_range[1] < 999:
+        filters.append("currency_number BETWEEN ? AND ?")
+        query_params.extend([currency_num_range[0], currency_num_range[1]])
+
+    return tuple(filters), tuple(query_params)
+
+def _set_page(page):
+    """Pagination button callback; runs before the rerun, so no st.rerun() is needed."""
+    st.session_state.current_page = page
+
+def _jump_to_page():
+    """Page box callback; copies the widget value into the plain current_page state."""
+    st.session_state.current_page = st.session_state.page_jump
+
+def _keyset_predicate(sort_by, ascending, cursor):
+    """
+    Build the WHERE predicate selecting rows after `cursor` in the explorer sort order.
+
+    NULLs sort first ascending and last descending, so a descending page past a non-NULL
+    cursor also has to take the NULL rows; ascending ones were all on earlier pages.
+
+    Args:
+        sort_by (str): Column the explorer is sorted by
+        ascending (bool): Sort direction
+        cursor (tuple): (sort_by value, country_code) of the last row on the previous page
+
+    Returns:
+        tuple: (predicate SQL, parameters)
+    """
+    op = ">" if ascending else "<"
+    last_value, last_code = cursor
+    if sort_by == "country_code":
+        return f"country_code {op} ?", (last_code,)
+    nulls = "" if ascending else f" OR {sort_by} IS NULL"
+    return (
+        f"({sort_by} {op} ? OR ({sort_by} = ? AND country_code {op} ?){nulls})",
+        (last_value, last_value, last_code)
+    )
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _export_csv(df):
+    """Serialize the explorer page as CSV with pyarrow's vectorized writer."""
+    import pyarrow as pa
+    import pyarrow.csv
+
+    output = io.BytesIO()
+    pyarrow.csv.write_csv(pa.Table.from_pandas(df, preserve_index=False), output)
+    return output.getvalue()
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _export_excel(df):
+    """Serialize the explorer page as an Excel workbook (xlsxwriter is loaded by pandas on first use)."""
+    output = io.BytesIO()
+    # constant_memory streams each finished row out instead of holding the whole sheet
+    with pd.ExcelWriter(output, engine='xlsxwriter',
+                        engine_kwargs={'options': {'constant_memory': True}}) as writer:
+        df.to_excel(writer, sheet_name='Country_Currency_Data', index=False)
+    return output.getvalue()
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _export_json(df):
+    """Serialize the explorer page as a JSON array of records."""
+    return df.to_json(orient="records")
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _export_parquet(df):
+    """Serialize the explorer page as zstd-compressed Parquet."""
+    output = io.BytesIO()
+    df.to_parquet(output, engine='pyarrow', compression='zstd', index=False)
+    return output.getvalue()
+
+@st.fragment
 def render_data_explorer():
-    """Render the data explorer tab with filtering and pagination."""
+    """
+    Render the data explorer tab with filtering and pagination.
+
+    Runs as a fragment: its widgets rerun only this tab, not the analytics queries.
+    """
     if st.session_state.data_loaded:
         # Initialize session state variables
         if "current_page" not in st.session_state:
@@ -156,9 +320,19 @@ def render_data_explorer():
         try:
             operations = DataOperations(st.session_state.databricks_client)
 
-            # Get data count for pagination
-            count_query = f"SELECT COUNT(*) as count FROM {operations.table_name}"
-            count_result = operations.client.execute_query(count_query)
+            # Add filters
+            filters, query_params = _build_filters(
+                st.session_state.filter_query,
+                st.session_state.search_type,
+                tuple(country_num_range),
+                tuple(currency_num_range)
+            )
+            where_clause = f" WHERE {' AND '.join(filters)}" if filters else ""
+
+            # Get data count for pagination. The count covers the same filters as the page and
+            # is cached per SQL text and parameters, so reruns that don't change them skip the warehouse.
+            count_query = f"SELECT COUNT(*) as count FROM {operations.table_name}{where_clause}"
+            count_result = run_cached_query(count_query, query_params)
             total_records = count_result[0]['count'] if count_result else 0
 
             # Calculate pagination
@@ -169,121 +343,107 @@ def render_data_explorer():
             if current_page != st.session_state.current_page:
                 st.session_state.current_page = current_page
 
-            # Pagination controls
-            col1, col2, col3, col4 = st.columns([1, 1, 1, 1])
+            # Pagination controls. The buttons and the page box update the page in callbacks, so
+            # each interaction costs one rerun (no st.rerun()). The box has its own key: widget
+            # state is dropped on runs that don't draw it, and current_page has to survive
+            # visits to the other views.
+            st.session_state.page_jump = current_page
+            col1, col2, col3, col4, col5 = st.columns([1, 1, 1, 1, 1])
 
             with col1:
-                if st.button("⏮️ First", disabled=current_page <= 1):
-                    st.session_state.current_page = 1
-                    st.rerun()
+                st.button("⏮️ First", disabled=current_page <= 1, on_click=_set_page, args=(1,))
 
             with col2:
-                if st.button("◀️ Previous", disabled=current_page <= 1):
-                    st.session_state.current_page = current_page - 1
-                    st.rerun()
+                st.button("◀️ Previous", disabled=current_page <= 1, on_click=_set_page, args=(current_page - 1,))
 
             with col3:
-                if st.button("Next ▶️", disabled=current_page >= total_pages):
-                    st.session_state.current_page = current_page + 1
-                    st.rerun()
+                st.number_input("Page", min_value=1, max_value=max(total_pages, 1), step=1,
+                                key="page_jump", on_change=_jump_to_page, label_visibility="collapsed")
 
             with col4:
-                if st.button("Last ⏭️", disabled=current_page >= total_pages):
-                    st.session_state.current_page = total_pages
-                    st.rerun()
+                st.button("Next ▶️", disabled=current_page >= total_pages, on_click=_set_page, args=(current_page + 1,))
+
+            with col5:
+                st.button("Last ⏭️", disabled=current_page >= total_pages, on_click=_set_page, args=(total_pages,))
 
             # Show pagination info
             st.caption(f"Page {current_page} of {total_pages} ({total_records} total records)")
 
-            # Get data for current page
-            offset = (current_page - 1) * st.session_state.rows_per_page
+            # Get data for current page. Pages reached by stepping from a neighbour continue
+            # after the last row of the previous page (keyset pagination), so the warehouse
+            # doesn't scan and discard `offset` rows; other jumps (e.g. Last) fall back to OFFSET.
+            rows_per_page = st.session_state.rows_per_page
+            sort_by = st.session_state.sort_by
+            sort_ascending = st.session_state.sort_ascending
+            direction = 'ASC' if sort_ascending else 'DESC'
+
+            # Cursors are only valid for the query they were taken from
+            cursor_signature = (where_clause, query_params, sort_by, sort_ascending, rows_per_page)
+            page_cursors = st.session_state.get("page_cursors")
+            if page_cursors is None or page_cursors["signature"] != cursor_signature:
+                page_cursors = {"signature": cursor_signature, "pages": {}}
+                st.session_state.page_cursors = page_cursors
+            cursor = page_cursors["pages"].get(current_page - 1)
 
             # Build query
-            query = f"SELECT * FROM {operations.table_name}"
-
-            # Add filters
-            filters = []
-            query_params = []
-
-            if st.session_state.filter_query:
-                # Build the filter string based on the search type
-                search_query = st.session_state.filter_query
-
-                if st.session_state.search_type == "contains":
-                    # Contains search (default)
-                    pattern = f"%{search_query}%"
-                    filter_str = (
-                        "LOWER(country) LIKE LOWER(?) OR " +
-                        "LOWER(country_code) LIKE LOWER(?) OR " +
-                        "LOWER(currency_name) LIKE LOWER(?) OR " +
-                        "LOWER(currency_code) LIKE LOWER(?)"
-                    )
-                    query_params.extend([pattern, pattern, pattern, pattern])
-                elif st.session_state.search_type == "starts_with":
-                    # Starts with search
-                    pattern = f"{search_query}%"
-                    filter_str = (
-                        "LOWER(country) LIKE LOWER(?) OR " +
-                        "LOWER(country_code) LIKE LOWER(?) OR " +
-                        "LOWER(currency_name) LIKE LOWER(?) OR " +
-                        "LOWER(currency_code) LIKE LOWER(?)"
-                    )
-                    query_params.extend([pattern, pattern, pattern, pattern])
-                elif st.session_state.search_type == "exact":
-                    # Exact match search
-                    filter_str = (
-                        "LOWER(country) = LOWER(?) OR " +
-                        "LOWER(country_code) = LOWER(?) OR " +
-                        "LOWER(currency_name) = LOWER(?) OR " +
-                        "LOWER(currency_code) = LOWER(?)"
-                    )
-                    query_params.extend([search_query, search_query, search_query, search_query])
-
-                filters.append(f"({filter_str})")
-
-            # Add numeric range filters
-            if "country_num_range" in locals() and (country_num_range[0] > 0 or country_num_range[1] < 999):
-                filters.append("country_number BETWEEN ? AND ?")
-                query_params.extend([country_num_range[0], country_num_range[1]])
-
-            if "currency_num_range" in locals() and (currency_num_range[0] > 0 or currency_num_range[1] < 999):
-                filters.append("currency_number BETWEEN ? AND ?")
-                query_params.extend([currency_num_range[0], currency_num_range[1]])
-
-            if filters:
-                query += f" WHERE {' AND '.join(filters)}"
-
-            # Add sorting
-            query += f" ORDER BY {st.session_state.sort_by} {'ASC' if st.session_state.sort_ascending else 'DESC'}"
+            page_filters = list(filters)
+            page_params = query_params
+            use_keyset = current_page > 1 and cursor is not None and cursor[0] is not None
+            if use_keyset:
+                predicate, predicate_params = _keyset_predicate(sort_by, sort_ascending, cursor)
+                page_filters.append(predicate)
+                page_params = query_params + predicate_params
+            query = f"SELECT {EXPLORER_COLUMNS_SQL} FROM {operations.table_name}"
+            if page_filters:
+                query += f" WHERE {' AND '.join(page_filters)}"
+
+            # Add sorting; country_code breaks ties so the order (and the cursors) are stable
+            if sort_by == "country_code":
+                query += f" ORDER BY country_code {direction}"
+            else:
+                # NULL placement is spelled out because _keyset_predicate relies on it
+                nulls = "NULLS FIRST" if sort_ascending else "NULLS LAST"
+                query += f" ORDER BY {sort_by} {direction} {nulls}, country_code {direction}"
 
             # Add pagination
-            query += f" LIMIT {st.session_state.rows_per_page} OFFSET {offset}"
+            query += f" LIMIT {rows_per_page}"
+            if not use_keyset:
+                query += f" OFFSET {(current_page - 1) * rows_per_page}"
 
-            # Execute query
+            # Execute query (parameterized for security). Cached per query text and parameters,
+            # so reruns that keep the same page, e.g. picking a row below, don't re-fetch it.
+            # The page comes back as an Arrow table, converted to pandas without per-row objects.
             with st.spinner("Loading data..."):
-                # Use parameterized query for security
-                if query_params:
-                    data = operations.client.execute_query(query, tuple(query_params))
-                else:
-                    data = operations.client.execute_query(query)
+                table = run_cached_arrow_query(query, page_params)
+
+            # Remember where this page ends so the next one can continue from it
+            if table.num_rows:
+                page_cursors["pages"][current_page] = (
+                    table.column(sort_by)[-1].as_py(),
+                    table.column("country_code")[-1].as_py()
+                )
 
-            if not data:
+            if not table.num_rows:
                 st.markdown(info_box("No data found with the current filters. Try different search criteria."), unsafe_allow_html=True)
             else:
                 # Convert to pandas DataFrame
-                df = pd.DataFrame(data)
+                df = table.to_pandas(types_mapper=pd.ArrowDtype)
+
+                # Page rows keyed by country code, for O(1) lookup of the selected row
+                rows_by_code = {row['country_code']: row for row in table.to_pylist()}
 
                 # Display the data with row actions
                 with st.container():
-                    # Display the dataframe
-                    st.dataframe(df, use_container_width=True)
+                    # Display the dataframe. It already has Arrow dtypes from the fetch, so it
+                    # goes to the browser without an object-column conversion.
+                    st.dataframe(df, use_container_width=True, hide_index=True, column_config=EXPLORER_COLUMN_CONFIG)
 
                     # Action buttons for selected row
                     col1, col2, col3 = st.columns([1, 1, 1])
 
                     with col1:
                         selected_code = st.selectbox("Select a row by Country Code", 
-                                                options=["-Select-"] + list(df['country_code']))
+                                                options=["-Select-"] + list(rows_by_code))
 
                     if selected_code and selected_code != "-Select-":
                         with col2:
@@ -300,7 +460,7 @@ def render_data_explorer():
 
                     # Info about selected row
                     if selected_code and selected_code != "-Select-":
-                        selected_row = df[df['country_code'] == selected_code].iloc[0]
+                        selected_row = rows_by_code[selected_code]
                         st.markdown(f"### Selected: {selected_row['country']} ({selected_row['country_code']})")
 
                         st.markdown(f"""
@@ -338,52 +498,45 @@ def render_data_explorer():
 
         # Only show export options if there's data to export
         if 'df' in locals() and not df.empty:
-            export_col1, export_col2, export_col3 = st.columns(3)
+            export_col1, export_col2, export_col3, export_col4 = st.columns(4)
 
+            # Payloads are passed as callables, so they are only built when a download is clicked;
+            # the serializers are cached by DataFrame content, so repeat downloads reuse the bytes
             with export_col1:
-                if st.button("📄 Export to CSV", use_container_width=True):
-                    # Convert dataframe to CSV
-                    csv = df.to_csv(index=False)
-
-                    # Create a download button
-                    st.download_button(
-                        label="Download CSV",
-                        data=csv,
-                        file_name="country_currency_data.csv",
-                        mime="text/csv",
-                        use_container_width=True
-                    )
+                st.download_button(
+                    label="📄 Export to CSV",
+                    data=partial(_export_csv, df),
+                    file_name="country_currency_data.csv",
+                    mime="text/csv",
+                    use_container_width=True
+                )
 
             with export_col2:
-                if st.button("📊 Export to Excel", use_container_width=True):
-                    # Convert dataframe to Excel
-                    output = io.BytesIO()
-                    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-                        df.to_excel(writer, sheet_name='Country_Currency_Data', index=False)
-                    excel_data = output.getvalue()
-
-                    # Create a download button
-                    st.download_button(
-                        label="Download Excel",
-                        data=excel_data,
-                        file_name="country_currency_data.xlsx",
-                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                        use_container_width=True
-                    )
+                st.download_button(
+                    label="📊 Export to Excel",
+                    data=partial(_export_excel, df),
+                    file_name="country_currency_data.xlsx",
+                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                    use_container_width=True
+                )
 
             with export_col3:
-                if st.button("📝 Export to JSON", use_container_width=True):
-                    # Convert dataframe to JSON
-                    json_data = df.to_json(orient="records")
-
-                    # Create a download button
-                    st.download_button(
-                        label="Download JSON",
-                        data=json_data,
-                        file_name="country_currency_data.json",
-                        mime="application/json",
-                        use_container_width=True
-                    )
+                st.download_button(
+                    label="📝 Export to JSON",
+                    data=partial(_export_json, df),
+                    file_name="country_currency_data.json",
+                    mime="application/json",
+                    use_container_width=True
+                )
+
+            with export_col4:
+                st.download_button(
+                    label="📦 Export to Parquet",
+                    data=partial(_export_parquet, df),
+                    file_name="country_currency_data.parquet",
+                    mime="application/vnd.apache.parquet",
+                    use_container_width=True
+                )
         else:
             st.info("No data available to export. Please load data first.")
 
@@ -413,25 +566,57 @@ def render_data_explorer():
     else:
         st.warning("Please connect to Databricks to load data.")
 
+def _numeric_summary_sql(table_name):
+    """Build one query returning describe()-style statistics and the correlation of the numeric columns."""
+    expressions = []
+    for column in ANALYTICS_NUMERIC_COLUMNS:
+        for _, suffix, template in NUMERIC_SUMMARY_STATS:
+            expressions.append(f"{template.format(column=column)} AS {column}_{suffix}")
+    expressions.append("CORR(country_number, currency_number) AS correlation")
+    return f"SELECT {', '.join(expressions)} FROM {table_name}"
+
+def _histogram_sql(table_name, column):
+    """Build a query counting `column` values per histogram bin over the ISO numeric code range."""
+    return (
+        f"SELECT width_bucket({column}, 0, {HISTOGRAM_RANGE_END}, {HISTOGRAM_BINS}) AS bin, COUNT(*) AS count "
+        f"FROM {table_name} WHERE {column} IS NOT NULL GROUP BY 1 ORDER BY 1"
+    )
+
+@st.fragment
 def render_analytics():
-    """Render the analytics tab with visualizations."""
+    """
+    Render the analytics tab with visualizations.
+
+    Runs as a fragment: changing the visualization reruns only this tab.
+    """
     if not st.session_state.data_loaded:
         st.warning("Please connect to Databricks to view analytics.")
         return
 
     try:
         operations = DataOperations(st.session_state.databricks_client)
+        table_name = operations.table_name
 
-        # Get data for analytics
-        query = f"SELECT * FROM {operations.table_name}"
-        data = operations.client.execute_query(query)
+        # Aggregate on the warehouse so only a handful of rows come back, whatever the
+        # table size; results are cached until refresh_data() is called
+        metrics = run_cached_query(
+            f"SELECT COUNT(*) AS total, COUNT(DISTINCT country_code) AS countries, "
+            f"COUNT(DISTINCT currency_code) AS currencies, COUNT(currency_code) AS with_currency "
+            f"FROM {table_name}"
+        )[0]
 
-        if not data:
+        if not metrics['total']:
             st.warning("No data available for analytics.")
             return
 
-        # Convert to pandas DataFrame
-        df = pd.DataFrame(data)
+        # Countries per currency, most used first
+        currency_counts = pd.DataFrame(
+            run_cached_query(
+                f"SELECT currency_code AS Currency, COUNT(*) AS Count FROM {table_name} "
+                f"WHERE currency_code IS NOT NULL GROUP BY currency_code ORDER BY Count DESC, Currency"
+            ),
+            columns=['Currency', 'Count']
+        )
 
         # Display analytics dashboard
         st.markdown(section_header("📊", "Data Analytics Dashboard"), unsafe_allow_html=True)
@@ -442,18 +627,17 @@ def render_analytics():
         col1, col2, col3, col4 = st.columns(4)
 
         with col1:
-            st.metric("Total Records", len(df))
+            st.metric("Total Records", metrics['total'])
 
         with col2:
-            st.metric("Unique Countries", df['country_code'].nunique())
+            st.metric("Unique Countries", metrics['countries'])
 
         with col3:
-            st.metric("Unique Currencies", df['currency_code'].nunique())
+            st.metric("Unique Currencies", metrics['currencies'])
 
         with col4:
             # Calculate average countries per currency
-            currency_counts = df['currency_code'].value_counts()
-            avg_countries_per_currency = currency_counts.mean()
+            avg_countries_per_currency = metrics['with_currency'] / metrics['currencies'] if metrics['currencies'] else float('nan')
             st.metric("Avg Countries per Currency", f"{avg_countries_per_currency:.2f}")
 
         st.markdown(card_end(), unsafe_allow_html=True)
@@ -469,10 +653,6 @@ def render_analytics():
         )
 
         if viz_type == "Currency Distribution":
-            # Count currencies
-            currency_counts = df['currency_code'].value_counts().reset_index()
-            currency_counts.columns = ['Currency', 'Count']
-
             # Only show top currencies if there are many
             if len(currency_counts) > 10:
                 shown_data = currency_counts.head(10)
@@ -488,34 +668,24 @@ def render_analytics():
             st.dataframe(currency_counts, use_container_width=True)
 
         elif viz_type == "Country Distribution by Currency":
-            # Get top currencies
-            top_currencies = df['currency_code'].value_counts().head(5).index.tolist()
-
-            # Filter data for top currencies
-            filtered_df = df[df['currency_code'].isin(top_currencies)]
-
-            # Group by currency and count countries
-            currency_country_counts = filtered_df.groupby('currency_code').size().reset_index()
-            currency_country_counts.columns = ['Currency', 'Count']
-
-            # Create chart
-            st.bar_chart(currency_country_counts, x='Currency', y='Count', use_container_width=True)
+            # Number of countries using the top 5 currencies
+            st.bar_chart(currency_counts.head(5), x='Currency', y='Count', use_container_width=True)
             st.caption("Number of countries using top 5 currencies")
 
-        elif viz_type == "Currency Number Distribution":
-            # Create histogram
-            fig = px.histogram(df, x="currency_number",
-                             title="Distribution of Currency Numbers",
-                             labels={"currency_number": "Currency Number", "count": "Frequency"},
-                             nbins=20)
-            st.plotly_chart(fig, use_container_width=True)
+        elif viz_type in ("Currency Number Distribution", "Country Number Distribution"):
+            column = "currency_number" if viz_type == "Currency Number Distribution" else "country_number"
+            label = "Currency Number" if column == "currency_number" else "Country Number"
+
+            # Histogram binned on the warehouse; plotted as bars starting at each bin's lower edge.
+            # plotly is imported here so sessions that never open a histogram don't load it.
+            import plotly.express as px
 
-        elif viz_type == "Country Number Distribution":
-            # Create histogram
-            fig = px.histogram(df, x="country_number",
-                             title="Distribution of Country Numbers",
-                             labels={"country_number": "Country Number", "count": "Frequency"},
-                             nbins=20)
+            bins = pd.DataFrame(run_cached_query(_histogram_sql(table_name, column)), columns=['bin', 'count'])
+            bins[column] = (bins['bin'] - 1) * HISTOGRAM_BIN_WIDTH
+            fig = px.bar(bins, x=column, y="count",
+                         title=f"Distribution of {label}s",
+                         labels={column: label, "count": "Frequency"})
+            fig.update_traces(offset=0, width=HISTOGRAM_BIN_WIDTH)
             st.plotly_chart(fig, use_container_width=True)
 
         st.markdown(card_end(), unsafe_allow_html=True)
@@ -524,18 +694,29 @@ def render_analytics():
         st.markdown(section_header("🔍", "Data Analysis"), unsafe_allow_html=True)
         st.markdown(card_start(), unsafe_allow_html=True)
 
-        # Calculate correlations between numeric columns
-        numeric_df = df.select_dtypes(include=['number'])
-        if len(numeric_df.columns) >= 2:
-            corr = numeric_df.corr()
+        # Correlation and summary statistics of the numeric columns, computed in one cached query.
+        # Opt-in, so switching visualizations doesn't also render (or first fetch) the statistics.
+        if st.checkbox("Show correlation and statistical summary", key="show_numeric_summary"):
+            summary = run_cached_query(_numeric_summary_sql(table_name))[0]
+            correlation = summary['correlation']
+            corr = pd.DataFrame(
+                [[1.0, correlation], [correlation, 1.0]],
+                index=list(ANALYTICS_NUMERIC_COLUMNS),
+                columns=list(ANALYTICS_NUMERIC_COLUMNS)
+            )
 
             st.write("### Correlation Matrix")
             st.dataframe(corr, use_container_width=True)
 
             st.write("### Statistical Summary")
-            st.dataframe(numeric_df.describe(), use_container_width=True)
-        else:
-            st.info("Not enough numeric columns for correlation analysis.")
+            describe_df = pd.DataFrame(
+                {
+                    column: [summary[f"{column}_{suffix}"] for _, suffix, _ in NUMERIC_SUMMARY_STATS]
+                    for column in ANALYTICS_NUMERIC_COLUMNS
+                },
+                index=[label for label, _, _ in NUMERIC_SUMMARY_STATS]
+            )
+            st.dataframe(describe_df, use_container_width=True)
 
         st.markdown(card_end(), unsafe_allow_html=True)
 
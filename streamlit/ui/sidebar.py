@@ -11,9 +11,31 @@ import json
 from config.app_config import AppConfig
 from utils.databricks_client import DatabricksClient
 from utils.status_checker import check_databricks_job_status
-from templates.html_components import section_header, card_start, card_end, success_message, error_message
+from templates.html_components import CARD_START, CARD_END, section_header, success_message, error_message
 from pathlib import Path
 
+# `key = "value"` assignments at the start of a terraform.tfvars line; comment lines
+# (`//`, `#`) never match, so the whole file is parsed in a single finditer scan
+TFVARS_ASSIGNMENT_PATTERN = re.compile(r'^[ \t]*(\w+)[ \t]*=[ \t]*"([^"\n]*)"', re.MULTILINE)
+
+# Config file locations, resolved once at import time
+TFVARS_PATH = Path(__file__).parent.parent.parent / 'terraform' / 'terraform.tfvars'
+CONNECTION_JSON_PATH = Path(__file__).parent.parent / 'databricks_connection.json'
+
+# Read buffer for the config files, large enough to read either in a single call
+CONFIG_READ_BUFFER_SIZE = 64 * 1024
+
+# Static content for the sidebar, built once at import time
+DATABRICKS_LOGO_URL = "https://databricks.com/wp-content/uploads/2021/10/DB-logo-clear-background-1.svg"
+CONNECTION_INFO_HEADER = section_header("🔌", "Connection Info")
+CONNECTION_INFO_ROW = (
+    '<div style="display: flex; margin-bottom: 8px;">'
+    '<div style="width: 80px; color: #4da6ff;">{label}:</div><div>{value}</div></div>'
+)
+
+# The config loaders run on every rerun; cache the parsed files (st.cache_data hands each
+# caller its own copy, so callers may modify the returned dict). Cleared on disconnect.
+@st.cache_data(ttl=300, show_spinner=False)
 def load_terraform_vars():
     """Load Databricks configuration from terraform.tfvars file"""
     config_values = {
@@ -26,26 +48,21 @@ def load_terraform_vars():
     }
 
     try:
-        # Get the path to terraform.tfvars
-        base_dir = Path(__file__).parent.parent.parent
-        tfvars_path = base_dir / 'terraform' / 'terraform.tfvars'
-
-        if tfvars_path.exists():
-            with open(tfvars_path, 'r') as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith('//'):
-                        # Parse key-value pairs
-                        match = re.match(r'(\w+)\s*=\s*"([^"]*)"', line)
-                        if match:
-                            key, value = match.groups()
-                            if key in config_values:
-                                config_values[key] = value
+        # Read the whole file in one buffered read (64 KiB covers any realistic tfvars)
+        with open(TFVARS_PATH, 'r', buffering=CONFIG_READ_BUFFER_SIZE) as f:
+            text = f.read()
+        for match in TFVARS_ASSIGNMENT_PATTERN.finditer(text):
+            key, value = match.groups()
+            if key in config_values:
+                config_values[key] = value
+        return config_values
+    except FileNotFoundError:
         return config_values
     except Exception as e:
         print(f"Error loading terraform.tfvars: {str(e)}")
         return config_values
 
+@st.cache_data(ttl=300, show_spinner=False)
 def load_connection_config_from_json():
     """Load Databricks connection configuration from the deployment JSON file"""
     config_values = {
@@ -58,22 +75,19 @@ def load_connection_config_from_json():
     }
 
     try:
-        # Get the path to the databricks_connection.json file
-        base_dir = Path(__file__).parent.parent
-        json_path = base_dir / 'databricks_connection.json'
-
-        if json_path.exists():
-            with open(json_path, 'r') as f:
-                data = json.load(f)
-                config_values.update({
-                    'databricks_host': data.get('databricks_host', ''),
-                    'databricks_token': data.get('databricks_token', ''),
-                    'catalog_name': data.get('catalog_name', 'main'),
-                    'schema_name': data.get('schema_name', 'default'),
-                    'table_name': data.get('table_name', 'country_currency'),
-                    'databricks_warehouse_id': data.get('databricks_warehouse_id', '')
-                })
-            return config_values, json_path.exists()
+        # Open directly instead of probing with exists() first: a missing file costs one failed open
+        with open(CONNECTION_JSON_PATH, 'r', buffering=CONFIG_READ_BUFFER_SIZE) as f:
+            data = json.load(f)
+        config_values.update({
+            'databricks_host': data.get('databricks_host', ''),
+            'databricks_token': data.get('databricks_token', ''),
+            'catalog_name': data.get('catalog_name', 'main'),
+            'schema_name': data.get('schema_name', 'default'),
+            'table_name': data.get('table_name', 'country_currency'),
+            'databricks_warehouse_id': data.get('databricks_warehouse_id', '')
+        })
+        return config_values, True
+    except FileNotFoundError:
         return config_values, False
     except Exception as e:
         print(f"Error loading databricks_connection.json: {str(e)}")
@@ -85,7 +99,7 @@ def render_sidebar():
     config_values = load_terraform_vars()
 
     with st.sidebar:
-        st.image("https://databricks.com/wp-content/uploads/2021/10/DB-logo-clear-background-1.svg", width=200)
+        st.image(DATABRICKS_LOGO_URL, width=200)
         st.title("Country Currency App")
 
         # Connection Status
@@ -124,8 +138,9 @@ def render_sidebar():
                         
                 st.sidebar.divider()
             
-            # Determine which config to use
-            if config_file_exists and st.session_state.get("load_from_file", True):
+            # Determine which config to use (the file is preferred unless the user chose manual entry)
+            use_deployment_config = config_file_exists and st.session_state.get("load_from_file", True)
+            if use_deployment_config:
                 # Use deployment config
                 active_config = deployment_config
                 config_source = "deployment file"
@@ -150,7 +165,7 @@ def render_sidebar():
                 default_warehouse_id = active_config.get('databricks_warehouse_id') or os.environ.get("DATABRICKS_WAREHOUSE_ID", "")
 
                 # Connection form fields
-                if config_file_exists and st.session_state.get("load_from_file", True):
+                if use_deployment_config:
                     st.caption("🔒 Most fields are pre-filled from deployment. Please provide your token.")
                 
                 host = st.text_input("Databricks Host", value=default_host, 
@@ -175,7 +190,7 @@ def render_sidebar():
                 else:
                     # Show spinner while connecting
                     status_placeholder = st.sidebar.empty()
-                    if config_file_exists and st.session_state.get("load_from_file", True):
+                    if use_deployment_config:
                         status_placeholder.info("Connecting to Databricks using deployment configuration...")
                     else:
                         status_placeholder.info("Connecting to Databricks...")
@@ -199,24 +214,28 @@ def render_sidebar():
                         connection_ok = client.test_connection()
 
                         if connection_ok:
+                            # Close the pool of any client this one replaces
+                            if st.session_state.get("databricks_client"):
+                                st.session_state.databricks_client.close()
                             st.session_state.databricks_client = client
                             st.session_state.authenticated = True
                             st.session_state.data_loaded = True
                             # Track if configuration was loaded from deployment file
-                            st.session_state.loaded_from_file = config_file_exists and st.session_state.get("load_from_file", True)
-                            if config_file_exists and st.session_state.get("load_from_file", True):
+                            st.session_state.loaded_from_file = use_deployment_config
+                            if use_deployment_config:
                                 status_placeholder.success("✅ Connected using deployment configuration!")
                             else:
                                 status_placeholder.success("✅ Connected to Databricks!")
                             st.rerun()
                         else:
+                            client.close()
                             status_placeholder.error("Connection test failed")
                     except Exception as e:
                         status_placeholder.error(f"Connection error: {str(e)}")
 
         elif st.session_state.authenticated:
             # Display navigation options in card
-            st.markdown(card_start(), unsafe_allow_html=True)
+            st.markdown(CARD_START, unsafe_allow_html=True)
 
             col1, col2 = st.columns(2)
             with col1:
@@ -229,48 +248,39 @@ def render_sidebar():
                     st.session_state.current_view = "add"
                     st.rerun()
 
-            st.markdown(card_end(), unsafe_allow_html=True)
+            st.markdown(CARD_END, unsafe_allow_html=True)
 
             # Display connection info in card
-            st.markdown(section_header("🔌", "Connection Info"), unsafe_allow_html=True)
-            st.markdown(card_start(), unsafe_allow_html=True)
+            st.markdown(CONNECTION_INFO_HEADER, unsafe_allow_html=True)
+            st.markdown(CARD_START, unsafe_allow_html=True)
 
-            st.markdown(f"""
-            <div style="font-size: 0.9rem;">
-                <div style="display: flex; margin-bottom: 8px;">
-                    <div style="width: 80px; color: #4da6ff;">Host:</div>
-                    <div>{st.session_state.config.host}</div>
-                </div>
-                <div style="display: flex; margin-bottom: 8px;">
-                    <div style="width: 80px; color: #4da6ff;">Catalog:</div>
-                    <div>{st.session_state.config.catalog}</div>
-                </div>
-                <div style="display: flex; margin-bottom: 8px;">
-                    <div style="width: 80px; color: #4da6ff;">Schema:</div>
-                    <div>{st.session_state.config.schema}</div>
-                </div>
-                <div style="display: flex; margin-bottom: 8px;">
-                    <div style="width: 80px; color: #4da6ff;">Table:</div>
-                    <div>{st.session_state.config.table}</div>
-                </div>
-                <div style="display: flex; margin-bottom: 8px;">
-                    <div style="width: 80px; color: #4da6ff;">Warehouse:</div>
-                    <div>{st.session_state.config.warehouse_id if st.session_state.config.warehouse_id else "Auto"}</div>
-                </div>
-                <div style="display: flex; margin-bottom: 8px;">
-                    <div style="width: 80px; color: #4da6ff;">Source:</div>
-                    <div>{"Deployment File" if st.session_state.get("loaded_from_file", False) else "Manual Entry"}</div>
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
+            config = st.session_state.config
+            connection_rows = "".join(
+                CONNECTION_INFO_ROW.format(label=label, value=value)
+                for label, value in (
+                    ("Host", config.host),
+                    ("Catalog", config.catalog),
+                    ("Schema", config.schema),
+                    ("Table", config.table),
+                    ("Warehouse", config.warehouse_id if config.warehouse_id else "Auto"),
+                    ("Source", "Deployment File" if st.session_state.get("loaded_from_file", False) else "Manual Entry")
+                )
+            )
+            st.markdown(f'<div style="font-size: 0.9rem;">{connection_rows}</div>', unsafe_allow_html=True)
 
-            st.markdown(card_end(), unsafe_allow_html=True)
+            st.markdown(CARD_END, unsafe_allow_html=True)
 
             # Add a disconnect button
             if st.button("🔓 Disconnect", use_container_width=True):
                 st.session_state.authenticated = False
+                if st.session_state.databricks_client:
+                    st.session_state.databricks_client.close()
                 st.session_state.databricks_client = None
+                st.session_state.pop("data_operations", None)
                 st.session_state.current_view = "home"
+                # Re-read the config files for the next connection
+                load_terraform_vars.clear()
+                load_connection_config_from_json.clear()
                 st.rerun()
 
         # Display app information
@@ -3,204 +3,288 @@ Visualization component for the Streamlit application.
 This module handles data visualization and analytics.
 """
 import streamlit as st
+from functools import partial
 import pandas as pd
 import altair as alt
 import plotly.express as px
 import plotly.graph_objects as go
-from operations.data_operations import DataOperations
+from utils.app_utils import get_data_operations, run_cached_query, run_cached_arrow_query
 from templates.html_components import (
+    CARD_START,
+    CARD_END,
     section_header, 
-    card_start, 
-    card_end, 
     field_label,
     info_box,
     analytics_card
 )
 
-def render_visualizations():
-    """Render data visualizations and analytics."""
-    if not st.session_state.get("authenticated", False):
-        return
-    
-    st.markdown(section_header("📈", "Data Analytics & Visualizations"), unsafe_allow_html=True)
-    
+# Static HTML for this view, rendered once at import time
+VISUALIZATIONS_HEADER = section_header("📈", "Data Analytics & Visualizations")
+
+# Numeric columns offered for statistical analysis
+VIZ_NUMERIC_COLUMNS = ("country_number", "currency_number")
+
+# Currencies shown in the "Currency Distribution" charts, most used first
+VIZ_TOP_CURRENCIES = 50
+
+# Rows sampled when a chart has to plot individual values
+VIZ_SAMPLE_ROWS = 10_000
+
+# Histogram bins over the ISO numeric code range (0-999), counted on the warehouse
+VIZ_HISTOGRAM_BINS = 20
+VIZ_HISTOGRAM_RANGE_END = 1000
+VIZ_HISTOGRAM_BIN_WIDTH = VIZ_HISTOGRAM_RANGE_END // VIZ_HISTOGRAM_BINS
+
+def _histogram_bins(table_name, column):
+    """Count `column` values per histogram bin; returns the bins' lower edges and counts."""
+    bins = pd.DataFrame(
+        run_cached_query(
+            f"SELECT width_bucket({column}, 0, {VIZ_HISTOGRAM_RANGE_END}, {VIZ_HISTOGRAM_BINS}) AS bin, "
+            f"COUNT(*) AS count FROM {table_name} WHERE {column} IS NOT NULL GROUP BY 1 ORDER BY 1"
+        ),
+        columns=['bin', 'count']
+    )
+    bins[column] = (bins['bin'] - 1) * VIZ_HISTOGRAM_BIN_WIDTH
+    return bins
+
+def _fetch_columns(table_name, columns):
+    """Fetch only `columns` of a VIZ_SAMPLE_ROWS-row sample, for the charts that plot individual values."""
+    # ORDER BY rand() spreads the sample over the whole table; a bare LIMIT (which is also what
+    # TABLESAMPLE (n ROWS) compiles to) would return whichever rows come first. A smaller table
+    # is returned whole, so no COUNT(*) is needed first
+    query = (
+        f"SELECT {', '.join(columns)} FROM {table_name} "
+        f"ORDER BY rand() LIMIT {VIZ_SAMPLE_ROWS}"
+    )
+    # Fetched as Arrow and converted column-wise, rather than inferring a frame from row dicts
+    df = run_cached_arrow_query(query).to_pandas()
+    # ISO numeric codes fit in small unsigned ints, and the text columns are low cardinality
+    for column in columns:
+        if column in VIZ_NUMERIC_COLUMNS:
+            df[column] = pd.to_numeric(df[column], downcast='unsigned')
+        else:
+            df[column] = df[column].astype('category')
+    return df
+
+def _currency_counts(table_name):
+    """Countries per currency for the VIZ_TOP_CURRENCIES most used currencies."""
+    return pd.DataFrame(
+        run_cached_query(
+            f"SELECT currency_code AS Currency, COUNT(*) AS Count FROM {table_name} "
+            f"WHERE currency_code IS NOT NULL GROUP BY currency_code "
+            f"ORDER BY Count DESC, Currency LIMIT {VIZ_TOP_CURRENCIES}"
+        ),
+        columns=['Currency', 'Count']
+    )
+
+def _currency_bar_chart(table_name):
+    """Bar chart of countries per currency."""
+    return px.bar(
+        _currency_counts(table_name), 
+        x='Currency', 
+        y='Count',
+        title='Number of Countries per Currency',
+        color='Count',
+        color_continuous_scale='Viridis'
+    )
+
+def _currency_pie_chart(table_name):
+    """Pie chart of the currency distribution."""
+    return px.pie(
+        _currency_counts(table_name), 
+        values='Count', 
+        names='Currency',
+        title='Currency Distribution'
+    )
+
+def _number_histogram(table_name, column, label):
+    """Histogram of a numeric code column."""
+    # Pre-binned on the warehouse; bars start at each bin's lower edge
+    fig = px.bar(
+        _histogram_bins(table_name, column), 
+        x=column,
+        y='count',
+        title=f'Distribution of {label}s'
+    )
+    fig.update_traces(offset=0, width=VIZ_HISTOGRAM_BIN_WIDTH)
+    return fig
+
+def _number_box_plot(table_name, column, label):
+    """Box plot of a numeric code column."""
+    return px.box(
+        _fetch_columns(table_name, (column,)), 
+        y=column,
+        title=f'{label} Statistics'
+    )
+
+def _country_currency_scatter(table_name):
+    """Scatter plot of country number vs currency number."""
+    return px.scatter(
+        _fetch_columns(
+            table_name,
+            ("country_number", "currency_number", "country", "currency_name", "currency_code")
+        ), 
+        x='country_number', 
+        y='currency_number',
+        hover_name='country',
+        hover_data=['currency_name'],
+        color='currency_code',
+        title='Country vs Currency Numbers'
+    )
+
+# Chart builders for each supported (visualization type, chart type) pair
+VIZ_CHARTS = {
+    ("Currency Distribution", "Bar Chart"): _currency_bar_chart,
+    ("Currency Distribution", "Pie Chart"): _currency_pie_chart,
+    ("Country Number Distribution", "Histogram"): partial(_number_histogram, column="country_number", label="Country Number"),
+    ("Country Number Distribution", "Box Plot"): partial(_number_box_plot, column="country_number", label="Country Number"),
+    ("Currency Number Distribution", "Histogram"): partial(_number_histogram, column="currency_number", label="Currency Number"),
+    ("Currency Number Distribution", "Box Plot"): partial(_number_box_plot, column="currency_number", label="Currency Number"),
+    ("Country-Currency Map", "Scatter Plot"): _country_currency_scatter
+}
+
+# Visualization types in display order, and the chart types each one supports
+VIZ_TYPES = tuple(dict.fromkeys(viz_type for viz_type, _ in VIZ_CHARTS))
+VIZ_CHART_TYPES = {
+    viz_type: tuple(chart_type for key, chart_type in VIZ_CHARTS if key == viz_type)
+    for viz_type in VIZ_TYPES
+}
+
+@st.fragment
+def _render_chart(table_name):
+    """
+    Render the visualization controls and the selected chart.
+
+    Runs as a fragment: changing its controls reruns only this section.
+    """
     try:
-        operations = DataOperations(st.session_state.databricks_client)
+        # Visualization Controls
+        st.markdown(CARD_START, unsafe_allow_html=True)
         
-        # Get full dataset for analytics
-        query = f"SELECT * FROM {operations.table_name}"
-        data = operations.client.execute_query(query)
+        viz_type = st.selectbox("Visualization Type", options=VIZ_TYPES)
         
-        if not data:
-            st.markdown(info_box("No data available for visualization."), unsafe_allow_html=True)
-            return
+        # Only the chart types that apply to the selected visualization are offered
+        chart_type = st.radio("Chart Type", options=VIZ_CHART_TYPES[viz_type], horizontal=True)
         
-        # Convert to pandas DataFrame
-        df = pd.DataFrame(data)
+        # Only the selected chart's data is fetched
+        fig = VIZ_CHARTS[viz_type, chart_type](table_name)
+        st.plotly_chart(fig, use_container_width=True)
+        
+        st.markdown(CARD_END, unsafe_allow_html=True)
+    except Exception as e:
+        st.error(f"Error generating visualizations: {str(e)}")
+        st.exception(e)
+
+@st.fragment
+def _render_statistics(table_name):
+    """
+    Render the statistical analysis of a numeric column.
+
+    Runs as a fragment: changing its controls reruns only this section.
+    """
+    try:
+        # Statistical Analysis Section
+        st.subheader("Statistical Analysis")
+        
+        # Numeric columns are fixed by the table schema
+        selected_col = st.selectbox("Select column for analysis", VIZ_NUMERIC_COLUMNS)
+        
+        st.markdown(CARD_START, unsafe_allow_html=True)
+        
+        # Basic stats, computed on the warehouse
+        stats = run_cached_query(
+            f"SELECT AVG({selected_col}) AS mean, MIN({selected_col}) AS min, "
+            f"percentile_approx({selected_col}, 0.5) AS median, MAX({selected_col}) AS max, "
+            f"STDDEV({selected_col}) AS std, COUNT({selected_col}) AS count FROM {table_name}"
+        )[0]
         
-        # Analytics Cards
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            st.markdown(card_start(), unsafe_allow_html=True)
-            unique_countries = len(df['country_code'].unique())
-            st.markdown(analytics_card("Unique Countries", unique_countries), unsafe_allow_html=True)
-            st.markdown(card_end(), unsafe_allow_html=True)
+            st.metric("Mean", f"{stats['mean']:.2f}")
+            st.metric("Min", f"{stats['min']:.2f}")
         
         with col2:
-            st.markdown(card_start(), unsafe_allow_html=True)
-            unique_currencies = len(df['currency_code'].unique())
-            st.markdown(analytics_card("Unique Currencies", unique_currencies), unsafe_allow_html=True)
-            st.markdown(card_end(), unsafe_allow_html=True)
-        
+            st.metric("Median", f"{stats['median']:.2f}")
+            st.metric("Max", f"{stats['max']:.2f}")
+            
         with col3:
-            st.markdown(card_start(), unsafe_allow_html=True)
-            countries_per_currency = df.groupby('currency_code').size().mean()
-            st.markdown(analytics_card("Avg Countries per Currency", f"{countries_per_currency:.2f}"), unsafe_allow_html=True)
-            st.markdown(card_end(), unsafe_allow_html=True)
+            st.metric("Std Dev", f"{stats['std']:.2f}")
+            st.metric("Count", int(stats['count']))
         
-        # Visualization Controls
-        st.markdown(card_start(), unsafe_allow_html=True)
+        st.markdown(CARD_END, unsafe_allow_html=True)
         
-        viz_type = st.selectbox(
-            "Visualization Type",
-            options=["Currency Distribution", "Country Number Distribution", "Currency Number Distribution", "Country-Currency Map"]
-        )
+        # Probability density histogram, binned on the warehouse so only the bin counts are sent
+        bins = _histogram_bins(table_name, selected_col)
+        fig = go.Figure()
         
-        chart_type = st.radio(
-            "Chart Type",
-            options=["Bar Chart", "Pie Chart", "Histogram", "Box Plot"],
-            horizontal=True
+        fig.add_trace(go.Bar(
+            x=bins[selected_col],
+            y=bins['count'] / (bins['count'].sum() * VIZ_HISTOGRAM_BIN_WIDTH),
+            width=VIZ_HISTOGRAM_BIN_WIDTH,
+            offset=0,
+            name='Histogram',
+            marker_color='#4da6ff',
+            opacity=0.7
+        ))
+        
+        fig.update_layout(
+            title=f"Distribution of {selected_col}",
+            xaxis_title=selected_col,
+            yaxis_title="Frequency",
+            template="plotly_dark"
         )
         
-        # Custom chart options based on visualization type
-        if viz_type == "Currency Distribution":
-            currency_counts = df['currency_code'].value_counts().reset_index()
-            currency_counts.columns = ['Currency', 'Count']
-            
-            if chart_type == "Bar Chart":
-                fig = px.bar(
-                    currency_counts, 
-                    x='Currency', 
-                    y='Count',
-                    title='Number of Countries per Currency',
-                    color='Count',
-                    color_continuous_scale='Viridis'
-                )
-                st.plotly_chart(fig, use_container_width=True)
-            
-            elif chart_type == "Pie Chart":
-                fig = px.pie(
-                    currency_counts, 
-                    values='Count', 
-                    names='Currency',
-                    title='Currency Distribution'
-                )
-                st.plotly_chart(fig, use_container_width=True)
-                
-        elif viz_type == "Country Number Distribution":
-            if chart_type == "Histogram":
-                fig = px.histogram(
-                    df, 
-                    x='country_number',
-                    nbins=20,
-                    title='Distribution of Country Numbers'
-                )
-                st.plotly_chart(fig, use_container_width=True)
-            
-            elif chart_type == "Box Plot":
-                fig = px.box(
-                    df, 
-                    y='country_number',
-                    title='Country Number Statistics'
-                )
-                st.plotly_chart(fig, use_container_width=True)
-                
-        elif viz_type == "Currency Number Distribution":
-            if chart_type == "Histogram":
-                fig = px.histogram(
-                    df, 
-                    x='currency_number',
-                    nbins=20,
-                    title='Distribution of Currency Numbers'
-                )
-                st.plotly_chart(fig, use_container_width=True)
-            
-            elif chart_type == "Box Plot":
-                fig = px.box(
-                    df, 
-                    y='currency_number',
-                    title='Currency Number Statistics'
-                )
-                st.plotly_chart(fig, use_container_width=True)
-                
-        elif viz_type == "Country-Currency Map":
-            # Create a scatter plot of country number vs currency number
-            fig = px.scatter(
-                df, 
-                x='country_number', 
-                y='currency_number',
-                hover_name='country',
-                hover_data=['currency_name'],
-                color='currency_code',
-                title='Country vs Currency Numbers'
-            )
-            st.plotly_chart(fig, use_container_width=True)
-        
-        st.markdown(card_end(), unsafe_allow_html=True)
+        st.plotly_chart(fig, use_container_width=True)
+    except Exception as e:
+        st.error(f"Error generating visualizations: {str(e)}")
+        st.exception(e)
+
+def render_visualizations():
+    """Render data visualizations and analytics."""
+    if not st.session_state.get("authenticated", False):
+        return
+    
+    st.markdown(VISUALIZATIONS_HEADER, unsafe_allow_html=True)
+    
+    try:
+        table_name = get_data_operations().table_name
+
+        # Aggregate on the warehouse instead of pulling the whole table into pandas;
+        # results are cached, so flipping chart controls doesn't go back to Databricks
+        metrics = run_cached_query(
+            f"SELECT COUNT(*) AS total, COUNT(DISTINCT country_code) AS countries, "
+            f"COUNT(DISTINCT currency_code) AS currencies, COUNT(currency_code) AS with_currency "
+            f"FROM {table_name}"
+        )[0]
+
+        if not metrics['total']:
+            st.markdown(info_box("No data available for visualization."), unsafe_allow_html=True)
+            return
+
+        # Mean group size of a GROUP BY currency_code, derived from the same scan
+        countries_per_currency = metrics['with_currency'] / metrics['currencies'] if metrics['currencies'] else 0
+
+        # Analytics Cards
+        col1, col2, col3 = st.columns(3)
         
-        # Statistical Analysis Section
-        st.subheader("Statistical Analysis")
+        with col1:
+            st.markdown(CARD_START, unsafe_allow_html=True)
+            st.markdown(analytics_card("Unique Countries", metrics['countries']), unsafe_allow_html=True)
+            st.markdown(CARD_END, unsafe_allow_html=True)
         
-        # Choose columns for analysis
-        numeric_cols = [col for col in df.columns if df[col].dtype in ['int64', 'float64']]
+        with col2:
+            st.markdown(CARD_START, unsafe_allow_html=True)
+            st.markdown(analytics_card("Unique Currencies", metrics['currencies']), unsafe_allow_html=True)
+            st.markdown(CARD_END, unsafe_allow_html=True)
         
-        if numeric_cols:
-            selected_col = st.selectbox("Select column for analysis", numeric_cols)
-            
-            st.markdown(card_start(), unsafe_allow_html=True)
-            
-            # Basic stats
-            stats = df[selected_col].describe()
-            
-            col1, col2, col3 = st.columns(3)
-            
-            with col1:
-                st.metric("Mean", f"{stats['mean']:.2f}")
-                st.metric("Min", f"{stats['min']:.2f}")
-            
-            with col2:
-                st.metric("Median", f"{stats['50%']:.2f}")
-                st.metric("Max", f"{stats['max']:.2f}")
-                
-            with col3:
-                st.metric("Std Dev", f"{stats['std']:.2f}")
-                st.metric("Count", int(stats['count']))
-            
-            st.markdown(card_end(), unsafe_allow_html=True)
-            
-            # Histogram with normal distribution curve
-            fig = go.Figure()
-            
-            fig.add_trace(go.Histogram(
-                x=df[selected_col],
-                histnorm='probability density',
-                name='Histogram',
-                marker_color='#4da6ff',
-                opacity=0.7
-            ))
-            
-            fig.update_layout(
-                title=f"Distribution of {selected_col}",
-                xaxis_title=selected_col,
-                yaxis_title="Frequency",
-                template="plotly_dark"
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
-            
-        else:
-            st.info("No numeric columns available for statistical analysis.")
+        with col3:
+            st.markdown(CARD_START, unsafe_allow_html=True)
+            st.markdown(analytics_card("Avg Countries per Currency", f"{countries_per_currency:.2f}"), unsafe_allow_html=True)
+            st.markdown(CARD_END, unsafe_allow_html=True)
+        
+        _render_chart(table_name)
+        _render_statistics(table_name)
         
     except Exception as e:
         st.error(f"Error generating visualizations: {str(e)}")
@@ -6,10 +6,113 @@ including functions for data management, UI helpers, and state management.
 """
 
 import streamlit as st
+import hashlib
 import logging
 
 logger = logging.getLogger(__name__)
 
+def get_data_operations():
+    """
+    Return the DataOperations instance for the current session's Databricks client.
+
+    The instance is kept in session state and rebuilt only when the client changes
+    (e.g. after reconnecting), so views don't construct a new one on every rerun.
+
+    Returns:
+        DataOperations: Operations bound to st.session_state.databricks_client
+    """
+    from operations.data_operations import DataOperations
+
+    client = st.session_state.databricks_client
+    operations = st.session_state.get("data_operations")
+    if operations is None or operations.client is not client:
+        operations = DataOperations(client)
+        st.session_state.data_operations = operations
+    return operations
+
+# How long cached query results are reused before going back to the warehouse
+QUERY_CACHE_TTL_SECONDS = 300
+
+def _connection_identity(operations):
+    """
+    Return a cache-key component identifying whose data a cached result is.
+
+    st.cache_data is shared by every session in the process, and table names are not
+    unique across workspaces, so cached results are keyed on the workspace host, the
+    warehouse and a fingerprint of the access token (never the token itself). Sessions
+    only share results when they connect the same way.
+
+    Args:
+        operations (DataOperations): Operations bound to the session's client
+
+    Returns:
+        tuple: (host, warehouse_id, token fingerprint)
+    """
+    config = operations.client.config
+    token_fingerprint = hashlib.sha256((config.token or "").encode("utf-8")).hexdigest()
+    return config.host, config.warehouse_id, token_fingerprint
+
+@st.cache_data(ttl=QUERY_CACHE_TTL_SECONDS, show_spinner=False)
+def _cached_record_count(_operations, identity, table_name):
+    """Count records in `table_name`; the leading underscore keeps the operations object out of the cache key."""
+    return _operations.count_records()
+
+def get_record_count():
+    """
+    Return the number of records in the configured table.
+
+    The count is cached across reruns (keyed by connection and table name) and cleared by refresh_data(),
+    so page flips and filter changes don't each issue a COUNT(*) against the warehouse.
+
+    Returns:
+        int: Total number of records
+    """
+    operations = get_data_operations()
+    return _cached_record_count(operations, _connection_identity(operations), operations.table_name)
+
+@st.cache_data(ttl=QUERY_CACHE_TTL_SECONDS, max_entries=128, show_spinner=False)
+def _cached_query(_operations, identity, query, params):
+    """Run a read-only query; the cache key is the connection identity, the SQL text and its parameters."""
+    return _operations.client.execute_query(query, params)
+
+def run_cached_query(query, params=None):
+    """
+    Execute a read-only query, reusing the result of an identical earlier query.
+
+    Intended for page fetches that users repeat while paging back and forth. Results
+    are only shared between sessions with the same connection identity (see
+    _connection_identity), and the cache is cleared by refresh_data(), so results
+    never outlive a data change made through the app.
+
+    Args:
+        query (str): SQL text (already containing the table name)
+        params (tuple, optional): Bound parameters for the query
+
+    Returns:
+        list: Query results as a list of dictionaries
+    """
+    operations = get_data_operations()
+    return _cached_query(operations, _connection_identity(operations), query, params)
+
+@st.cache_data(ttl=QUERY_CACHE_TTL_SECONDS, max_entries=128, show_spinner=False)
+def _cached_arrow_query(_operations, identity, query, params):
+    """Arrow counterpart of _cached_query."""
+    return _operations.client.execute_query_arrow(query, params)
+
+def run_cached_arrow_query(query, params=None):
+    """
+    Execute a read-only query and return a pyarrow Table, cached like run_cached_query().
+
+    Args:
+        query (str): SQL text (already containing the table name)
+        params (tuple, optional): Bound parameters for the query
+
+    Returns:
+        pyarrow.Table: Query results
+    """
+    operations = get_data_operations()
+    return _cached_arrow_query(operations, _connection_identity(operations), query, params)
+
 def refresh_data(reset_page=True, show_message=False):
     """
     Refresh data by clearing any cached state.
@@ -20,8 +123,12 @@ def refresh_data(reset_page=True, show_message=False):
         show_message (bool): Whether to display a success message
     """
     # Clear any cached data
-    if "last_refresh" in st.session_state:
-        st.session_state.pop("last_refresh", None)
+    st.session_state.pop("last_refresh", None)
+    st.session_state.pop("cached_record", None)
+    st.session_state.pop("page_cursors", None)
+    _cached_record_count.clear()
+    _cached_query.clear()
+    _cached_arrow_query.clear()
     
     # Reset to first page of results if requested
     if reset_page and "current_page" in st.session_state:
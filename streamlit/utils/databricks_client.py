@@ -4,7 +4,10 @@ Databricks client for connecting to Databricks and performing operations.
 import logging
 import threading
 import socket
-from queue import Queue, Empty
+import time
+import weakref
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
 from databricks.sdk import WorkspaceClient
 from databricks.sql import connect
 from config.app_config import AppConfig
@@ -12,11 +15,56 @@ from config.app_config import AppConfig
 # Configure logger
 logger = logging.getLogger(__name__)
 
+# Longest query text written to the debug log
+LOGGED_QUERY_MAX_LENGTH = 100
+
+class QueryTextFilter(logging.Filter):
+    """Truncate long SQL text arguments, only for records that are actually emitted."""
+
+    def filter(self, record):
+        if record.args and isinstance(record.args, tuple) and isinstance(record.args[0], str) \
+                and len(record.args[0]) > LOGGED_QUERY_MAX_LENGTH:
+            record.args = (record.args[0][:LOGGED_QUERY_MAX_LENGTH] + "...",) + record.args[1:]
+        return True
+
+# Query text is logged through its own child logger, so the truncation applies only to it
+query_logger = logger.getChild("query")
+query_logger.addFilter(QueryTextFilter())
+
 # Define a timeout exception for cross-platform compatibility
 class TimeoutException(Exception):
     """Exception raised when an operation times out."""
     pass
 
+# Idle pooled connections are revalidated with SELECT 1 on checkout only after this long
+POOL_VALIDATE_AFTER_SECONDS = 30
+# Idle connections older than this are closed by the pool's pruner thread, which runs
+# every POOL_PRUNE_INTERVAL_SECONDS
+POOL_IDLE_TIMEOUT_SECONDS = 60
+POOL_PRUNE_INTERVAL_SECONDS = 30
+
+# How long the authenticated user and job run statuses fetched from the workspace API are reused
+CURRENT_USER_CACHE_SECONDS = 60
+JOB_STATUS_CACHE_SECONDS = 5
+
+def _open_connection(config, connection_timeout):
+    """Open a new SQL connection to the configured warehouse.
+
+    The SQL connector retries failed requests for minutes before giving up, so a plain TCP
+    connect bounded by connection_timeout first surfaces DNS and network errors immediately.
+    """
+    try:
+        host, _, port = config.hostname.partition(":")
+        socket.create_connection((host, int(port or 443)), timeout=connection_timeout).close()
+    except OSError as e:
+        raise ConnectionError(f"Cannot reach {config.hostname}: {str(e)}") from e
+    return connect(
+        server_hostname=config.hostname,
+        http_path=config.http_path,
+        access_token=config.token,
+        connect_timeout=connection_timeout
+    )
+
 class ConnectionPool:
     """A simple connection pool for Databricks SQL connections."""
 
@@ -31,104 +79,286 @@ class ConnectionPool:
         self.config = config
         self.max_connections = max_connections
         self.connection_timeout = connection_timeout
-        self.pool = Queue(maxsize=max_connections)
+        # Idle (connection, released_at) pairs, oldest first. deque.append/pop are atomic, so
+        # checkout and release of an idle connection take no lock; self.lock only guards
+        # the connection count and the waiters
+        self.pool = deque()
         self.active_connections = 0
         self.lock = threading.Lock()
-        self.server_hostname = config.host.replace("https://", "")
-
-        # Determine the HTTP path based on warehouse_id
-        if hasattr(config, 'warehouse_id') and config.warehouse_id:
-            self.http_path = f"sql/1.0/warehouses/{config.warehouse_id}"
-        else:
-            self.http_path = "sql/1.0/warehouses/auto"
-
-        logger.info(f"Initialized connection pool with max_connections={max_connections}")
+        # Futures of threads waiting for a connection, oldest first; a release hands its
+        # connection straight to the oldest one
+        self.waiters = deque()
+        self.server_hostname = config.hostname
+        self.http_path = config.http_path
+
+        # Close connections that sit idle too long, off the query path. The thread holds only
+        # a weak reference, so a pool dropped without close_all() is still collected
+        self.closed = threading.Event()
+        self.pruner = threading.Thread(
+            target=self._prune_idle,
+            args=(weakref.ref(self), self.closed),
+            name="databricks-pool-pruner",
+            daemon=True
+        )
+        self.pruner.start()
+
+        logger.info("Initialized connection pool with max_connections=%s", max_connections)
+
+    def _free_slot(self):
+        """Give up a connection slot; the oldest waiter (if any) is woken to create a connection."""
+        with self.lock:
+            self.active_connections -= 1
+            if self.waiters:
+                self.waiters.popleft().set_result(None)
+
+    def _discard(self, connection):
+        """Close a connection that is leaving the pool and free its slot."""
+        try:
+            connection.close()
+        except Exception:
+            pass
+        self._free_slot()
+
+    @staticmethod
+    def _prune_idle(pool_ref, closed):
+        """Periodically prune the pool until it is closed or garbage collected."""
+        while not closed.wait(POOL_PRUNE_INTERVAL_SECONDS):
+            pool = pool_ref()
+            if pool is None:
+                return
+            pool._prune_expired()
+            # Don't keep the pool alive while waiting for the next round
+            del pool
+
+    def _prune_expired(self):
+        """Close connections idle longer than POOL_IDLE_TIMEOUT_SECONDS."""
+        cutoff = time.monotonic() - POOL_IDLE_TIMEOUT_SECONDS
+        expired = []
+        # Under the lock, so a checkout can't find the pool empty and queue up while a live
+        # connection is briefly taken out below
+        with self.lock:
+            # The oldest idle connections are at the left end; checkouts take from the right
+            while True:
+                try:
+                    connection, released_at = self.pool.popleft()
+                except IndexError:
+                    break
+                if released_at > cutoff:
+                    self.pool.appendleft((connection, released_at))
+                    break
+                expired.append(connection)
+            # Hand any connection left in the pool to threads already waiting, as release does
+            while self.waiters and self.pool:
+                self.waiters.popleft().set_result(self.pool.pop()[0])
+
+        # Closing is slow and _discard takes the lock to free the slots, so it runs after
+        for connection in expired:
+            logger.debug("Closing idle connection")
+            self._discard(connection)
 
     def get_connection(self):
         """Get a connection from the pool or create a new one if needed."""
-        # Try to get a connection from the pool first
-        try:
-            connection = self.pool.get(block=False)
-            logger.debug("Reusing existing connection from pool")
-            return connection
-        except Empty:
-            # No connections available in the pool, create a new one if under the limit
+        # Fast path: reuse the most recently returned (warmest) idle connection, without locking.
+        # Connections idle for a while are checked first, since the server may have dropped them.
+        while True:
+            try:
+                connection, released_at = self.pool.pop()
+            except IndexError:
+                break
+            if time.monotonic() - released_at < POOL_VALIDATE_AFTER_SECONDS:
+                logger.debug("Reusing existing connection from pool")
+                return connection
+            try:
+                cursor = connection.cursor()
+                cursor.execute("SELECT 1")
+                cursor.close()
+                logger.debug("Reusing revalidated connection from pool")
+                return connection
+            except Exception as e:
+                logger.warning("Closing invalid connection: %s", e)
+                self._discard(connection)
+
+        # Slow path: create a new connection if under the limit, otherwise queue up for one.
+        # Connections found here were released moments ago, so they skip validation.
+        deadline = time.monotonic() + self.connection_timeout
+        while True:
             with self.lock:
+                try:
+                    return self.pool.pop()[0]
+                except IndexError:
+                    pass
+
                 if self.active_connections < self.max_connections:
                     self.active_connections += 1
-                    logger.debug(f"Creating new connection (active: {self.active_connections})")
-                    try:
-                        connection = connect(
-                            server_hostname=self.server_hostname,
-                            http_path=self.http_path,
-                            access_token=self.config.token,
-                            connect_timeout=self.connection_timeout
-                        )
-                        return connection
-                    except Exception as e:
-                        self.active_connections -= 1
-                        logger.error(f"Error creating connection: {str(e)}")
-                        raise
+                    waiter = None
                 else:
-                    # Wait for a connection to become available
-                    logger.warning(f"Connection pool exhausted, waiting for a connection")
+                    waiter = Future()
+                    self.waiters.append(waiter)
+                    # A release that appended before seeing this waiter left its connection in the pool
                     try:
-                        return self.pool.get(block=True, timeout=self.connection_timeout)
-                    except Empty:
+                        connection = self.pool.pop()[0]
+                    except IndexError:
+                        pass
+                    else:
+                        self.waiters.remove(waiter)
+                        return connection
+
+            if waiter is None:
+                # The slot is reserved, so the (slow) connect runs without holding the lock
+                logger.debug("Creating new connection (active: %s)", self.active_connections)
+                try:
+                    return _open_connection(self.config, self.connection_timeout)
+                except Exception as e:
+                    self._free_slot()
+                    logger.error("Error creating connection: %s", e)
+                    raise
+
+            # Wait for a connection to be handed over
+            logger.warning("Connection pool exhausted, waiting for a connection")
+            try:
+                connection = waiter.result(timeout=max(deadline - time.monotonic(), 0))
+            except FutureTimeoutError:
+                with self.lock:
+                    if not waiter.done():
+                        self.waiters.remove(waiter)
                         logger.error("Timeout waiting for a connection")
                         raise TimeoutException("Timeout waiting for a database connection")
+                # Handed a connection just as the wait timed out
+                connection = waiter.result()
+
+            if connection is not None:
+                return connection
+            # Woken because a slot was freed rather than with a connection: try again
 
     def release_connection(self, connection):
-        """Return a connection to the pool."""
-        try:
-            # Check if the connection is still valid
-            cursor = connection.cursor()
-            cursor.execute("SELECT 1")
-            cursor.close()
-
-            # Return to the pool
-            self.pool.put(connection, block=False)
-            logger.debug("Connection returned to pool")
-        except Exception as e:
-            # Connection is no longer valid, close it and decrement counter
-            logger.warning(f"Closing invalid connection: {str(e)}")
-            try:
-                connection.close()
-            except:
-                pass
+        """Return a connection to the pool.
+
+        No round trip here: idle connections are validated on checkout and pruned in the
+        background, so returning one is local work. If threads are waiting, the oldest one
+        gets the connection directly.
+        """
+        if self.waiters:
+            with self.lock:
+                if self.waiters:
+                    self.waiters.popleft().set_result(connection)
+                    logger.debug("Connection handed to waiting thread")
+                    return
+
+        self.pool.append((connection, time.monotonic()))
+        logger.debug("Connection returned to pool")
+        # A thread that queued up after the check above may have missed this connection
+        if self.waiters:
             with self.lock:
-                self.active_connections -= 1
+                while self.waiters and self.pool:
+                    self.waiters.popleft().set_result(self.pool.pop()[0])
 
     def close_all(self):
         """Close all connections in the pool."""
         logger.info("Closing all connections in the pool")
-        # Close connections in the pool
-        while not self.pool.empty():
+        self.closed.set()
+        # Drain and close the idle connections, then release their slots in one update
+        drained = 0
+        while True:
             try:
-                connection = self.pool.get(block=False)
-                connection.close()
-                with self.lock:
-                    self.active_connections -= 1
-            except Empty:
+                connection, _ = self.pool.pop()
+            except IndexError:
                 break
+            drained += 1
+            try:
+                connection.close()
             except Exception as e:
-                logger.error(f"Error closing connection: {str(e)}")
+                logger.error("Error closing connection: %s", e)
+        with self.lock:
+            self.active_connections -= drained
+
+        logger.info("Connection pool closed, active connections: %s", self.active_connections)
 
-        logger.info(f"Connection pool closed, active connections: {self.active_connections}")
+class SingleConnectionPool:
+    """A pool of one persistent connection, for clients that run one query at a time.
+
+    A Streamlit session issues its queries sequentially, so one connection behind a lock
+    serves it without the idle queue, waiter hand-off or pruner thread of ConnectionPool.
+    It offers the same get_connection/release_connection/close_all interface.
+    """
+
+    def __init__(self, config, connection_timeout=30):
+        """Initialize the pool; the connection is opened on first use.
+
+        Args:
+            config: The AppConfig object with connection details
+            connection_timeout: Timeout for connection operations in seconds
+        """
+        self.config = config
+        self.max_connections = 1
+        self.connection_timeout = connection_timeout
+        # Held from get_connection() until release_connection(); reentrant so a nested
+        # checkout on the same thread doesn't deadlock
+        self.lock = threading.RLock()
+        self.connection = None
+        self.released_at = 0.0
+
+        logger.info("Initialized single-connection pool")
+
+    def get_connection(self):
+        """Get the pool's connection, opening (or reopening) it if needed."""
+        if not self.lock.acquire(timeout=self.connection_timeout):
+            logger.error("Timeout waiting for a connection")
+            raise TimeoutException("Timeout waiting for a database connection")
+        try:
+            if self.connection is not None and time.monotonic() - self.released_at >= POOL_VALIDATE_AFTER_SECONDS:
+                try:
+                    cursor = self.connection.cursor()
+                    cursor.execute("SELECT 1")
+                    cursor.close()
+                except Exception as e:
+                    logger.warning("Closing invalid connection: %s", e)
+                    try:
+                        self.connection.close()
+                    except Exception:
+                        pass
+                    self.connection = None
+            if self.connection is None:
+                logger.debug("Creating new connection")
+                self.connection = _open_connection(self.config, self.connection_timeout)
+            return self.connection
+        except Exception:
+            self.lock.release()
+            raise
+
+    def release_connection(self, connection):
+        """Return the connection, letting the next caller use it."""
+        self.released_at = time.monotonic()
+        self.lock.release()
+
+    def close_all(self):
+        """Close the connection."""
+        logger.info("Closing the pooled connection")
+        with self.lock:
+            if self.connection is not None:
+                try:
+                    self.connection.close()
+                except Exception as e:
+                    logger.error("Error closing connection: %s", e)
+                self.connection = None
 
 class DatabricksClient:
     """Client for interacting with Databricks APIs."""
 
-    def __init__(self, config: AppConfig, pool_size=5):
+    def __init__(self, config: AppConfig, pool_size=None):
         """Initialize the Databricks client.
 
         Args:
             config: The AppConfig object with connection details
-            pool_size: Size of the connection pool
+            pool_size: Size of the connection pool (defaults to config.pool_size)
         """
+        if pool_size is None:
+            pool_size = config.pool_size
         self.config = config
         self.workspace_client = None
         self.connection_pool = None
+        # (fetched_at, value) entries for workspace API lookups repeated across reruns
+        self._current_user = None
+        self._job_status = {}
 
         # Initialize the workspace client
         try:
@@ -138,16 +368,19 @@ class DatabricksClient:
             )
             logger.info("Workspace client initialized")
         except Exception as e:
-            logger.error(f"Error initializing workspace client: {str(e)}")
+            logger.error("Error initializing workspace client: %s", e)
 
         # Initialize the connection pool
-        self.connection_pool = ConnectionPool(config, max_connections=pool_size)
-        logger.info(f"Connection pool initialized with size {pool_size}")
+        if pool_size <= 1:
+            self.connection_pool = SingleConnectionPool(config)
+        else:
+            self.connection_pool = ConnectionPool(config, max_connections=pool_size)
+        logger.info("Connection pool initialized with size %s", pool_size)
 
     def test_connection(self) -> bool:
         """Test the connection to Databricks."""
         try:
-            logger.info(f"Testing workspace API connection to {self.config.host}")
+            logger.info("Testing workspace API connection to %s", self.config.host)
 
             # Test workspace API connection if not already initialized
             if not self.workspace_client:
@@ -158,9 +391,9 @@ class DatabricksClient:
 
             # Get current user to test connection
             logger.info("Testing API authentication...")
-            user = self.workspace_client.current_user.me()
+            user = self._get_current_user()
             username = user.user_name if hasattr(user, 'user_name') else 'Unknown'
-            logger.info(f"API authentication successful. Connected as: {username}")
+            logger.info("API authentication successful. Connected as: %s", username)
 
             # Test SQL connection using the connection pool
             logger.info("Testing SQL connection...")
@@ -173,7 +406,7 @@ class DatabricksClient:
                         logger.info("Executing test query...")
                         cursor.execute("SELECT 1")
                         result = cursor.fetchall()
-                        logger.info(f"SQL connection test successful. Result: {result}")
+                        logger.info("SQL connection test successful. Result: %s", result)
                 finally:
                     # Return the connection to the pool
                     self.connection_pool.release_connection(connection)
@@ -182,25 +415,32 @@ class DatabricksClient:
                 return True
 
             except Exception as e:
-                logger.error(f"SQL connection test failed: {str(e)}")
+                logger.error("SQL connection test failed: %s", e)
                 raise
 
         except TimeoutException as e:
-            logger.error(f"Connection timeout: {str(e)}")
+            logger.error("Connection timeout: %s", e)
             return False
         except Exception as e:
-            logger.error(f"Connection error: {type(e).__name__}: {str(e)}")
+            logger.error("Connection error: %s: %s", type(e).__name__, e)
             logger.exception("Connection test failed with exception:")
             return False
 
+    def _get_current_user(self):
+        """Return the authenticated workspace user, fetched at most once per CURRENT_USER_CACHE_SECONDS."""
+        now = time.monotonic()
+        if self._current_user is None or now - self._current_user[0] > CURRENT_USER_CACHE_SECONDS:
+            self._current_user = (now, self.workspace_client.current_user.me())
+        return self._current_user[1]
+
     def execute_query(self, query: str, params: tuple = None) -> list:
         """Execute a SQL query and return the results using a connection from the pool."""
         connection = None
         try:
             # Get a connection from the pool
-            logger.debug(f"Executing query: {query[:100]}{'...' if len(query) > 100 else ''}")
+            query_logger.debug("Executing query: %s", query)
             if params:
-                logger.debug(f"Query parameters: {params}")
+                logger.debug("Query parameters: %s", params)
 
             connection = self.connection_pool.get_connection()
 
@@ -210,25 +450,48 @@ class DatabricksClient:
                 else:
                     cursor.execute(query)
 
-                # Get column names
-                columns = [desc[0] for desc in cursor.description] if cursor.description else []
+                # Fetch results and convert to a list of dictionaries. The connector receives
+                # results as Arrow; converting that straight to dicts (in C++) skips building a
+                # Row object per row only to unpack it again.
+                result_dicts = cursor.fetchall_arrow().to_pylist()
+
+                logger.debug("Query returned %s results", len(result_dicts))
+                return result_dicts
+
+        except Exception as e:
+            logger.error("Query execution error: %s", e)
+            raise
+        finally:
+            # Return the connection to the pool if it was obtained
+            if connection:
+                self.connection_pool.release_connection(connection)
 
-                # Fetch results
-                result = cursor.fetchall()
+    def execute_query_arrow(self, query: str, params: tuple = None):
+        """Execute a SQL query and return the results as a pyarrow Table.
 
-                # Convert to list of dictionaries
-                result_dicts = []
-                for row in result:
-                    row_dict = {}
-                    for i, col_name in enumerate(columns):
-                        row_dict[col_name] = row[i]
-                    result_dicts.append(row_dict)
+        Uses the connector's native Arrow result path, so no Python object is built
+        per row; convert with Table.to_pandas() where a DataFrame is needed.
+        """
+        connection = None
+        try:
+            query_logger.debug("Executing Arrow query: %s", query)
+            if params:
+                logger.debug("Query parameters: %s", params)
 
-                logger.debug(f"Query returned {len(result_dicts)} results")
-                return result_dicts
+            connection = self.connection_pool.get_connection()
+
+            with connection.cursor() as cursor:
+                if params:
+                    cursor.execute(query, params)
+                else:
+                    cursor.execute(query)
+
+                table = cursor.fetchall_arrow()
+                logger.debug("Arrow query returned %s rows", table.num_rows)
+                return table
 
         except Exception as e:
-            logger.error(f"Query execution error: {str(e)}")
+            logger.error("Arrow query execution error: %s", e)
             raise
         finally:
             # Return the connection to the pool if it was obtained
@@ -238,26 +501,34 @@ class DatabricksClient:
     def get_job_status(self, job_id: str) -> dict:
         """Get the status of a Databricks job."""
         try:
-            logger.info(f"Getting status for job ID: {job_id}")
+            logger.info("Getting status for job ID: %s", job_id)
 
             if not self.workspace_client:
                 logger.error("Workspace client not initialized")
                 return None
 
+            # Status checks repeat on every rerun; reuse a run fetched within the last few seconds
+            now = time.monotonic()
+            cached = self._job_status.get(job_id)
+            if cached is not None and now - cached[0] <= JOB_STATUS_CACHE_SECONDS:
+                return cached[1]
+
             runs = self.workspace_client.jobs.list_runs(
                 job_id=job_id,
                 limit=1
             )
 
             if runs:
-                logger.info(f"Found run for job ID {job_id}")
-                return runs[0]
+                logger.info("Found run for job ID %s", job_id)
+                run = runs[0]
             else:
-                logger.warning(f"No runs found for job ID {job_id}")
-                return None
+                logger.warning("No runs found for job ID %s", job_id)
+                run = None
+            self._job_status[job_id] = (now, run)
+            return run
 
         except Exception as e:
-            logger.error(f"Error getting job status: {str(e)}")
+            logger.error("Error getting job status: %s", e)
             logger.exception("Exception details:")
             raise
 
@@ -269,5 +540,5 @@ class DatabricksClient:
                 self.connection_pool.close_all()
                 logger.info("Connection pool closed successfully")
             except Exception as e:
-                logger.error(f"Error closing connection pool: {str(e)}")
+                logger.error("Error closing connection pool: %s", e)
                 logger.exception("Exception details:")
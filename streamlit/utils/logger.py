@@ -10,14 +10,14 @@ from pathlib import Path
 # Can be set to "1" to enable debug output
 DEBUG_MODE = os.environ.get("DEBUG_MODE", "0") == "1"
 
-# Configure logging
-logging.basicConfig(
-    level=logging.DEBUG if DEBUG_MODE else logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler()
-    ]
-)
+# Configure logging. Install the console handler only once: Streamlit re-imports modules
+# when they change, and a second handler would emit (and format) every record twice.
+_root_logger = logging.getLogger()
+if not any(isinstance(handler, logging.StreamHandler) for handler in _root_logger.handlers):
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    _root_logger.addHandler(_handler)
+    _root_logger.setLevel(logging.DEBUG if DEBUG_MODE else logging.INFO)
 
 def get_logger(name):
     """Get a logger with the specified name."""
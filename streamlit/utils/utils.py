@@ -4,10 +4,17 @@ Utility functions for the Streamlit application.
 import os
 import streamlit as st
 
+@st.cache_data(show_spinner=False)
+def _read_css(css_file_path, mtime):
+    """Read a stylesheet; `mtime` is part of the cache key, so an edited file is read again."""
+    with open(css_file_path, 'r', encoding='utf-8') as f:
+        return f.read()
+
 def load_css(css_file_path):
     """Load CSS from a file and inject it into the Streamlit app"""
-    if os.path.exists(css_file_path):
-        with open(css_file_path, 'r') as f:
-            st.markdown(f'<style>{f.read()}</style>', unsafe_allow_html=True)
-    else:
+    try:
+        mtime = os.path.getmtime(css_file_path)
+    except OSError:
         st.error(f"CSS file not found: {css_file_path}")
+        return
+    st.markdown(f'<style>{_read_css(css_file_path, mtime)}</style>', unsafe_allow_html=True)